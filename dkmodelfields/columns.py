@@ -0,0 +1,110 @@
+"""
+Columnar export/import of field values as typed arrays.
+
+``field.export_column(queryset)`` runs a query selecting only the
+(integer) database value of the field, and streams the cursor rows
+straight into an ``array.array`` (or a NumPy array), so no per-row model
+instances or ttcal objects are created::
+
+    >>> field = Invoice._meta.get_field('month')
+    >>> field.export_column(Invoice.objects.filter(paid=True))
+    array('i', [24240, 24241, ...])             # month indexes
+
+``field.import_column(model, values)`` is the inverse: it creates one
+instance per value with ``bulk_create``, storing the database value
+directly on the instances.
+"""
+from array import array
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import BigIntegerField, F, IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from .subclassing import unconverted_key
+
+
+class ColumnMixin:
+    """Adds export_column() and import_column() to a field.
+
+       Subclasses set ``column_typecode`` (the array typecode), and can
+       override ``column_expression()`` (the SQL expression giving the
+       array value) and ``column_db_value()`` (the database value for an
+       array value).
+    """
+    column_typecode = 'q'
+
+    def column_expression(self):
+        return F(self.attname)
+
+    def column_db_value(self, value):
+        return value
+
+    def column_output_field(self):
+        return BigIntegerField() if self.column_typecode == 'q' else IntegerField()
+
+    def export_column(self, queryset, null_value=0, numpy=False, chunk_size=10000):
+        """Return the values of this field for the rows of `queryset` (in
+           queryset order) as an ``array(self.column_typecode)``.
+
+           NULLs are exported as `null_value`.  With ``numpy=True`` a NumPy
+           array (sharing the array's buffer) is returned instead.
+
+           The default `null_value` (0) can't be told apart from a zero
+           duration, so pass e.g. ``null_value=-1`` (to both
+           export_column() and import_column()) for DurationFields that
+           are nullable.
+        """
+        expr = Coalesce(self.column_expression(), Value(null_value),
+                        output_field=self.column_output_field())
+        qs = queryset.values_list(expr)
+        res = array(self.column_typecode)
+        try:
+            sql, params = qs.query.get_compiler(qs.db).as_sql()
+        except EmptyResultSet:
+            sql = None
+        if sql is not None:
+            with connections[qs.db].cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchmany(chunk_size)
+                while rows:
+                    res.extend([row[0] for row in rows])
+                    rows = cursor.fetchmany(chunk_size)
+        if numpy:
+            import numpy as np
+            return np.frombuffer(res, dtype=res.typecode)
+        return res
+
+    def import_column(self, model, values, null_value=0, batch_size=1000, **fields):
+        """Create one `model` instance per value in `values` (e.g. the
+           result of export_column()), using ``bulk_create`` with
+           `batch_size` objects per query.  None, and values equal to
+           `null_value` (the same default as export_column(), so zero
+           durations are imported as NULL unless another `null_value` is
+           given), are imported as NULL, and `fields` are passed to the
+           model constructor.  Returns the number of objects created.
+        """
+        name = self.name
+        pending = unconverted_key(self)
+        db_value = self.column_db_value
+        manager = model._default_manager
+        count = 0
+        batch = []
+        for value in values:
+            obj = model(**fields)
+            # bypass the descriptor, the value is saved as is (int() in
+            # case `values` is a NumPy array)
+            if value is None or value == null_value:
+                obj.__dict__[name] = None
+            else:
+                obj.__dict__[name] = db_value(int(value))
+            obj.__dict__.pop(pending, None)
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                manager.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            manager.bulk_create(batch)
+            count += len(batch)
+        return count
@@ -3,23 +3,113 @@ Based on https://github.com/johnpaulett/django-durationfield.
 """
 # pylint:disable=R0904
 import datetime
+import decimal
+import functools
 
 from django.db import models
 from django.utils.encoding import smart_str, smart_text
+from django.utils.functional import cached_property
 
 import ttcal
 
 from .adminforms import DurationField as DurationFormField
-from .subclassing import SubfieldBase
+from .columns import ColumnMixin
+from .subclassing import LazyFieldMixin, SubfieldBase, unconverted_key
+from .utils import xstr_to_timedelta
 
+#: precision -> number of stored units per second
+PRECISIONS = {'s': 1, 'ms': 1000, 'us': 1000000}
 
-class DurationField(models.Field, metaclass=SubfieldBase):
+
+def _units_to_duration_fn(scale):
+    """Return a function converting a number of 1/`scale` seconds to a
+       ttcal.Duration.  (ttcal.Duration's own constructor only keeps
+       whole seconds.)
+    """
+    new = datetime.timedelta.__new__
+    duration = ttcal.Duration
+    if scale == 1:
+        def units_to_duration(seconds):
+            return new(duration, 0, seconds)
+    else:
+        usecs = 1000000 // scale
+
+        def units_to_duration(units):
+            seconds, microseconds = divmod(units * usecs, 1000000)
+            return new(duration, 0, seconds, microseconds)
+    return units_to_duration
+
+
+def _to_units(value, scale=1):
+    """The database value (1/`scale` seconds) for an int or timedelta
+       (incl. ttcal.Duration) `value`, without creating any objects.
+       Returns None for other values.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, datetime.timedelta):
+        seconds = value.days * 86400 + value.seconds
+        if scale == 1:
+            return seconds
+        return seconds * scale + value.microseconds // (1000000 // scale)
+    return None
+
+
+class DurationField(LazyFieldMixin, ColumnMixin, models.Field, metaclass=SubfieldBase):
     """A duration field is used.
+
+       Pass ``cache_size=N`` to re-use the ttcal.Duration objects for the
+       N most recently used second-counts (useful when a column contains
+       mostly repeated values).  Like ``lazy``, it is not part of
+       deconstruct(), so changing it needs no migration.
+
+       Values are stored as whole seconds.  With ``precision='ms'`` or
+       ``precision='us'`` they are stored as milli-/microseconds instead,
+       and ints assigned to the field (or passed in queries) are in these
+       units.  Sum() and Avg() aggregates are converted to Durations (Avg
+       is rounded to the nearest unit), and value_to_string() (i.e.
+       dumpdata) writes the number of units.
+
+       export_column()/import_column() use the stored units (cf.
+       dkmodelfields.columns).
     """
     description = "A duration of time"
+    column_typecode = 'q'
 
     def __init__(self, *args, **kwargs):
+        self.cache_size = kwargs.pop('cache_size', None)
+        self.precision = kwargs.pop('precision', 's')
+        if self.precision not in PRECISIONS:
+            raise ValueError(
+                f"precision must be one of {sorted(PRECISIONS)}, not {self.precision!r}"
+            )
+        self.scale = PRECISIONS[self.precision]
         super().__init__(*args, **kwargs)
+        self._units_to_duration = _units_to_duration_fn(self.scale)
+        if self.cache_size:
+            self._units_to_duration = functools.lru_cache(
+                maxsize=self.cache_size
+            )(self._units_to_duration)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.precision != 's':
+            kwargs['precision'] = self.precision
+        return name, path, args, kwargs
+
+    def cache_info(self):
+        """Returns the hits/misses/maxsize/currsize of the Duration cache
+           (cf. functools.lru_cache), or None if caching is disabled.
+        """
+        if not self.cache_size:
+            return None
+        return self._units_to_duration.cache_info()
+
+    def cache_clear(self):
+        """Empty the Duration cache and reset its counters.
+        """
+        if self.cache_size:
+            self._units_to_duration.cache_clear()
 
     def get_internal_type(self):
         return "DurationField"
@@ -37,11 +127,20 @@ class DurationField(models.Field, metaclass=SubfieldBase):
            backend. In our case this is an integer representing the number
            of seconds elapsed.
         """
-        if value is None:
-            return None  # db NULL
-        if isinstance(value, int):
-            value = ttcal.Duration(seconds=value)
-        return value.toint()
+        units = _to_units(value, self.scale)
+        if units is None and value is not None:
+            units = _to_units(self.to_python(value), self.scale)
+        return units
+
+    @cached_property
+    def _pending(self):
+        return unconverted_key(self)
+
+    def pre_save(self, model_instance, add):
+        if self.lazy and self._pending in model_instance.__dict__:
+            # save the value as assigned, without converting it
+            return model_instance.__dict__[self.name]
+        return super().pre_save(model_instance, add)
 
     def get_db_prep_save(self, value, connection):
         return self.get_db_prep_value(value, connection=connection)
@@ -51,11 +150,9 @@ class DurationField(models.Field, metaclass=SubfieldBase):
            backend. In our case this is an integer representing the number
            of seconds elapsed.
         """
-        if value is None:
-            return None  # db NULL
-        if isinstance(value, int):
-            value = ttcal.Duration(seconds=value)
-        return value.toint()
+        if value is None or isinstance(value, int):
+            return value
+        return self.get_prep_value(value)
 
     def from_db_value(self, value, *args):
         """Converts a value as returned by the database to a Python object.
@@ -78,13 +175,27 @@ class DurationField(models.Field, metaclass=SubfieldBase):
             return value
 
         if isinstance(value, datetime.timedelta):
-            return ttcal.Duration(value)
+            if self.scale == 1:
+                return ttcal.Duration(value)
+            return datetime.timedelta.__new__(
+                ttcal.Duration, value.days, value.seconds, value.microseconds
+            )
 
         if isinstance(value, int):
-            return ttcal.Duration(seconds=value)
+            return self._units_to_duration(value)
+
+        if isinstance(value, (float, decimal.Decimal)):
+            # e.g. Avg() aggregates
+            return self._units_to_duration(int(round(value)))
 
         # Try to parse the value
         str_val = smart_str(value)
+        if self.scale != 1:
+            # value_to_string() writes the (signed) number of units
+            units = str_val.strip()
+            if units.lstrip('-').isdigit():
+                return self._units_to_duration(int(units))
+            return self.to_python(xstr_to_timedelta(units))
         if isinstance(str_val, str):
             try:
                 return ttcal.Duration.parse(str_val)
@@ -101,6 +212,9 @@ class DurationField(models.Field, metaclass=SubfieldBase):
             value = ""
         else:
             value = self.value_from_object(obj)
+            if value is not None and self.scale != 1:
+                # the number of units keeps the sub-second part and the sign
+                return str(self.get_prep_value(value))
         return smart_text(value)
 
     def formfield(self, **kwargs):  # pylint:disable=W0221
@@ -0,0 +1,224 @@
+"""
+Opt-in instrumentation of the dkmodelfields conversion methods.
+
+::
+
+    from dkmodelfields import instrumentation
+
+    instrumentation.enable()
+    ...
+    instrumentation.stats()
+    # {('app.Invoice', 'month'): {'from_db_value': {'calls': 1200,
+    #                                               'seconds': 0.0021,
+    #                                               'errors': 0}, ...}}
+    instrumentation.cache_stats()
+    # {'month': {'hits': 1188, 'misses': 12, 'hit_rate': 0.99}, ...}
+    instrumentation.flush()     # sends stats_flushed, and resets
+
+enable() replaces ``to_python``, ``get_prep_value``, ``get_db_prep_value``
+and ``get_db_converters`` on the field classes with timing wrappers (every
+converter Django applies to query results is counted as
+``from_db_value``), and disable() puts the originals back, so there is no
+cost when the instrumentation is disabled.  Counts are per model/field.
+
+Connect to ``stats_flushed`` to push the numbers to a metrics system::
+
+    @receiver(instrumentation.stats_flushed)
+    def push(sender, stats, caches, **kwargs):
+        ...
+"""
+import functools
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.dispatch import Signal
+
+from . import monthfield, yearfield
+
+#: sent by flush() with ``stats`` and ``caches`` (cf. stats(), cache_stats())
+stats_flushed = Signal()
+
+METHODS = ('to_python', 'get_prep_value', 'get_db_prep_value')
+
+# (model label, field name, method) -> [calls, seconds, errors]
+_counters = defaultdict(lambda: [0, 0.0, 0])
+# (model label, field name) -> field
+_fields = {}
+# cache name -> [hits, misses]
+_caches = defaultdict(lambda: [0, 0])
+# (owner, attribute) -> original value (None if it wasn't set on owner)
+_originals = {}
+
+
+def field_classes():
+    """The field classes that are instrumented.
+    """
+    from .durationfield import DurationField
+    from .norway import GateField, PostnrField, PoststedField, TelefonField
+    from .phonefield import TelephoneField
+    from .statusfield import StatusField
+    return [
+        monthfield.MonthField, yearfield.YearField, DurationField, StatusField,
+        TelephoneField, TelefonField, GateField, PostnrField, PoststedField,
+    ]
+
+
+def _key(field):
+    model = getattr(field, 'model', None)
+    key = (model._meta.label if model is not None else None, field.name)
+    if key not in _fields:
+        _fields[key] = field
+    return key
+
+
+def _record(field, method, start, failed=False):
+    counter = _counters[_key(field) + (method,)]
+    counter[0] += 1
+    counter[1] += time.perf_counter() - start
+    if failed:
+        counter[2] += 1
+
+
+def _timed_method(fn, method):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            res = fn(self, *args, **kwargs)
+        except Exception:
+            _record(self, method, start, failed=True)
+            raise
+        _record(self, method, start)
+        return res
+    return wrapper
+
+
+def _timed_converter(field, converter):
+    @functools.wraps(converter)
+    def wrapper(value, expression, connection):
+        start = time.perf_counter()
+        try:
+            res = converter(value, expression, connection)
+        except Exception:
+            _record(field, 'from_db_value', start, failed=True)
+            raise
+        _record(field, 'from_db_value', start)
+        return res
+    return wrapper
+
+
+def _instrumented_converters(fn):
+    @functools.wraps(fn)
+    def get_db_converters(self, connection):
+        return [_timed_converter(self, c) for c in fn(self, connection)]
+    return get_db_converters
+
+
+def _counted_cache(name, fn, cached):
+    @functools.wraps(fn)
+    def wrapper(*args):
+        _caches[name][0 if cached(*args) else 1] += 1
+        return fn(*args)
+    return wrapper
+
+
+def _year_cached(year):
+    ix = year - yearfield.YEAR_CACHE_RANGE[0]
+    return 0 <= ix < len(yearfield._years) and yearfield._years[ix] is not None
+
+
+def _patch(owner, attr, value):
+    _originals[(owner, attr)] = owner.__dict__.get(attr)
+    setattr(owner, attr, value)
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def enable():
+    """Start instrumenting the field classes (a no-op if already enabled).
+    """
+    if is_enabled():
+        return
+    for cls in field_classes():
+        for method in METHODS:
+            _patch(cls, method, _timed_method(getattr(cls, method), method))
+        _patch(cls, 'get_db_converters',
+               _instrumented_converters(cls.get_db_converters))
+    _patch(monthfield, 'get_month', _counted_cache(
+        'month', monthfield.get_month,
+        lambda year, month: (year, month) in monthfield._months))
+    _patch(yearfield, 'get_year', _counted_cache(
+        'year', yearfield.get_year, _year_cached))
+
+
+def disable():
+    """Restore the original methods.  The collected numbers are kept.
+    """
+    for (owner, attr), original in _originals.items():
+        if original is None:
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+    _originals.clear()
+
+
+@contextmanager
+def instrumented():
+    """Enable the instrumentation for the duration of a with-block.
+    """
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def reset():
+    """Forget all collected numbers.
+    """
+    _counters.clear()
+    _fields.clear()
+    _caches.clear()
+
+
+def stats():
+    """Return ``{(model label, field name): {method: {'calls', 'seconds',
+       'errors'}}}``.  (The model label is None for fields that are not
+       attached to a model.)
+    """
+    res = defaultdict(dict)
+    for (label, name, method), (calls, seconds, errors) in _counters.items():
+        res[(label, name)][method] = dict(calls=calls, seconds=seconds, errors=errors)
+    return dict(res)
+
+
+def _hit_rate(hits, misses):
+    return dict(hits=hits, misses=misses,
+                hit_rate=hits / (hits + misses) if hits + misses else None)
+
+
+def cache_stats():
+    """Return the hits, misses and hit rate of the shared Month/Year
+       instance caches (``'month'``, ``'year'``), and of the Duration cache
+       of each DurationField with a ``cache_size`` (keyed by model label
+       and field name).
+    """
+    res = {name: _hit_rate(*counts) for name, counts in _caches.items()}
+    for key, field in _fields.items():
+        info = getattr(field, 'cache_info', lambda: None)()
+        if info is not None:
+            res[key] = _hit_rate(info.hits, info.misses)
+    return res
+
+
+def flush(sender=None):
+    """Send `stats_flushed` with the current numbers, and reset them.
+       Returns the stats.
+    """
+    res = stats()
+    stats_flushed.send(sender=sender, stats=res, caches=cache_stats())
+    reset()
+    return res
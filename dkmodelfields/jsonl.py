@@ -0,0 +1,172 @@
+"""
+Streaming JSON-lines serializer with compact encodings for the
+dkmodelfields types, for dumpdata/loaddata of large tables::
+
+    SERIALIZATION_MODULES = {'dkjsonl': 'dkmodelfields.jsonl'}
+
+    python manage.py dumpdata app.Model --format dkjsonl -o data.dkjsonl
+    python manage.py loaddata data.dkjsonl
+
+One object is written per line as soon as it has been serialized, and
+parsed lines are fed lazily to Django's python deserializer, so neither
+side holds the full data set in memory (pass ``queryset.iterator()`` when
+serializing directly).
+
+MonthField values are written as ``"YYYY-MM"``, YearField values as the
+year (an int), and DurationField values as the number of seconds (or
+milli-/microseconds, cf. its ``precision``) as an int.
+The encoders read the value stored on the instance, so lazy fields (and
+``storage='int'`` months) are serialized without being converted.
+
+``load()`` loads a dump with chunked ``bulk_create`` instead of saving one
+object at a time.
+"""
+import json
+
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import (
+    Deserializer as PythonDeserializer, Serializer as PythonSerializer,
+)
+from django.db import DEFAULT_DB_ALIAS
+
+from .durationfield import DurationField
+from .monthfield import MonthField
+from .yearfield import YearField
+
+_missing = object()
+
+
+def encode_month(field, value):
+    if isinstance(value, int):      # unconverted storage='int' value
+        year, month = divmod(value, 12)
+        return '%04d-%02d' % (year, month + 1)
+    return '%04d-%02d' % (value.year, value.month)
+
+
+def encode_year(field, value):
+    return value if isinstance(value, int) else value.year
+
+
+def encode_duration(field, value):
+    return field.get_prep_value(value)      # in the field's precision
+
+
+#: field class -> function(field, value) encoding the value stored on the instance
+ENCODERS = {
+    MonthField: encode_month,
+    YearField: encode_year,
+    DurationField: encode_duration,
+}
+
+
+class Serializer(PythonSerializer):
+    """Convert a queryset to JSON lines.
+    """
+    internal_use_only = False
+
+    def _init_options(self):
+        self._current = None
+        self._encoders = {}
+        self.json_kwargs = self.options.copy()
+        self.json_kwargs.pop('stream', None)
+        self.json_kwargs.pop('fields', None)
+        self.json_kwargs.pop('indent', None)
+        self.json_kwargs['separators'] = (',', ':')
+        self.json_kwargs.setdefault('cls', DjangoJSONEncoder)
+        self.json_kwargs.setdefault('ensure_ascii', False)
+
+    def start_serialization(self):
+        self._init_options()
+
+    def _encoder(self, field):
+        try:
+            return self._encoders[field]
+        except KeyError:
+            encoder = None
+            for cls, fn in ENCODERS.items():
+                if isinstance(field, cls):
+                    encoder = fn
+                    break
+            self._encoders[field] = encoder
+            return encoder
+
+    def handle_field(self, obj, field):
+        encoder = self._encoder(field)
+        if encoder is None:
+            return super().handle_field(obj, field)
+        value = obj.__dict__.get(field.name, _missing)
+        if value is _missing:                       # deferred field
+            value = getattr(obj, field.name)
+        if value is None or value == '':
+            self._current[field.name] = None
+        elif isinstance(value, (str, bytes)):      # assigned to a lazy field
+            super().handle_field(obj, field)
+        else:
+            self._current[field.name] = encoder(field, value)
+
+    def end_object(self, obj):
+        # self._current has the field data
+        json.dump(self.get_dump_object(obj), self.stream, **self.json_kwargs)
+        self.stream.write("\n")
+        self._current = None
+
+    def getvalue(self):
+        # Grandparent super
+        return super(PythonSerializer, self).getvalue()
+
+
+def Deserializer(stream_or_string, **options):  # noqa: N802
+    """Deserialize a stream or string of JSON lines.
+    """
+    if isinstance(stream_or_string, bytes):
+        stream_or_string = stream_or_string.decode()
+    if isinstance(stream_or_string, str):
+        stream_or_string = stream_or_string.split("\n")
+
+    def objects():
+        loads = json.loads
+        for line in stream_or_string:
+            if line.strip():
+                yield loads(line)
+
+    # a single python deserializer, so its per-model caches are re-used
+    try:
+        yield from PythonDeserializer(objects(), **options)
+    except (GeneratorExit, DeserializationError):
+        raise
+    except Exception as exc:
+        raise DeserializationError() from exc
+
+
+def load(stream_or_string, batch_size=1000, using=DEFAULT_DB_ALIAS, **options):
+    """Load JSON lines into the database using ``bulk_create``, with up to
+       `batch_size` objects per query.  Returns the number of objects.
+
+       Objects with many-to-many data or forward references are saved one
+       at a time.  As with ``bulk_create``, ``save()`` is not called and no
+       signals are sent.
+    """
+    count = 0
+    batch = []
+
+    def flush():
+        if batch:
+            type(batch[0])._default_manager.db_manager(using).bulk_create(batch)
+            batch.clear()
+
+    for obj in Deserializer(stream_or_string, using=using, **options):
+        count += 1
+        if obj.m2m_data or obj.deferred_fields:
+            flush()
+            obj.save(using=using)
+            if obj.deferred_fields:
+                obj.save_deferred_fields(using=using)
+            continue
+        if batch and type(obj.object) is not type(batch[0]):
+            flush()
+        batch.append(obj.object)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return count
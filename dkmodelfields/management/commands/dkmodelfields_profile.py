@@ -0,0 +1,136 @@
+"""
+Profile the cost of converting the dkmodelfields columns of a table::
+
+    python manage.py dkmodelfields_profile app.Model [--chunk-size N] [--limit N]
+                                                     [--max-distinct N]
+
+The rows are streamed in chunks (as ``queryset.iterator()`` does) without
+Django's converters, and the fetch and each column's ``from_db_value()``
+are timed separately.  Allocations are measured with tracemalloc on the
+first chunk only (tracemalloc slows everything down), and the number of
+distinct database values shows whether sharing instances would pay off
+(counting stops at --max-distinct, reported as ``>N``, so memory use stays
+bounded on large tables).
+"""
+import time
+import tracemalloc
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models.sql.constants import MULTI
+
+from dkmodelfields.instrumentation import field_classes
+
+
+def profiled_fields(model):
+    """The dkmodelfields fields of `model` that convert database values.
+    """
+    classes = tuple(field_classes())
+    return [f for f in model._meta.concrete_fields
+            if isinstance(f, classes) and hasattr(f, 'from_db_value')]
+
+
+def allocations(field, values, connection):
+    """Return the (bytes, blocks) allocated by converting `values` (that
+       are still alive afterwards).
+    """
+    before = tracemalloc.take_snapshot()
+    converted = [field.from_db_value(v, None, connection) for v in values]  # noqa
+    after = tracemalloc.take_snapshot()
+    diff = after.compare_to(before, 'filename')
+    return (sum(s.size_diff for s in diff if s.size_diff > 0),
+            sum(s.count_diff for s in diff if s.count_diff > 0))
+
+
+class Command(BaseCommand):
+    help = "Profile the conversion of a model's dkmodelfields columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='app_label.ModelName')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--limit', type=int, default=None,
+                            help='only profile the first LIMIT rows')
+        parser.add_argument('--max-distinct', type=int, default=10000,
+                            help='stop counting distinct values at MAX_DISTINCT')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        fields = profiled_fields(model)
+        if not fields:
+            raise CommandError(f"{model._meta.label} has no dkmodelfields columns")
+
+        chunk_size = options['chunk_size']
+        max_distinct = options['max_distinct']
+        connection = connections[options['database']]
+        qs = model._default_manager.using(options['database']).order_by()
+        if options['limit'] is not None:
+            qs = qs[:options['limit']]
+        qs = qs.values_list(*[f.attname for f in fields])
+
+        rows = 0
+        fetch = 0.0
+        convert = [0.0] * len(fields)
+        distinct = [set() for _f in fields]
+        allocated = None
+
+        chunks = qs.query.get_compiler(qs.db).execute_sql(
+            MULTI, chunked_fetch=True, chunk_size=chunk_size
+        )
+        chunks = iter(chunks) if chunks is not None else iter(())
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            fetch += time.perf_counter() - start
+            if not chunk:
+                break
+            rows += len(chunk)
+            for i, field in enumerate(fields):
+                values = [row[i] for row in chunk]
+                from_db_value = field.from_db_value
+                start = time.perf_counter()
+                for v in values:
+                    from_db_value(v, None, connection)
+                convert[i] += time.perf_counter() - start
+                seen = distinct[i]
+                if seen is not None:
+                    seen.update(values)
+                    if len(seen) > max_distinct:
+                        distinct[i] = None      # too many to keep counting
+            if allocated is None:
+                tracemalloc.start()
+                try:
+                    allocated = [
+                        allocations(f, [row[i] for row in chunk], connection)
+                        for i, f in enumerate(fields)
+                    ]
+                finally:
+                    tracemalloc.stop()
+                sample = len(chunk)
+
+        self.stdout.write(
+            f"{model._meta.label}: {rows} rows, fetched in {fetch:.3f}s"
+            f" ({self._rate(rows, fetch)} rows/sec)"
+        )
+        if not rows:
+            return
+        self.stdout.write(
+            f"{'column':20} {'field':15} {'seconds':>9} {'rows/sec':>12}"
+            f" {'bytes/row':>10} {'allocs/row':>10} {'distinct':>9}"
+        )
+        for i, field in enumerate(fields):
+            size, count = allocated[i]
+            ndistinct = f'>{max_distinct}' if distinct[i] is None else len(distinct[i])
+            self.stdout.write(
+                f"{field.attname:20} {type(field).__name__:15} {convert[i]:9.3f}"
+                f" {self._rate(rows, convert[i]):>12} {size / sample:10.1f}"
+                f" {count / sample:10.2f} {ndistinct:>9}"
+            )
+
+    @staticmethod
+    def _rate(rows, seconds):
+        return f'{rows / seconds:,.0f}' if seconds else '-'
@@ -3,18 +3,122 @@ A database field class that goes with ttcal.Year.
 """
 # pylint:disable=C0209
 import datetime
+import time
 
 from django.contrib.admin import SimpleListFilter
-from django.core.exceptions import ValidationError
-from django.db import models, connection as cn
-from django.db.models import Transform, IntegerField
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured, ValidationError
+from django.db import models, migrations, connection as cn
+from django.db.models import Func, Lookup, Transform, IntegerField, DateField
+from django.db.models.functions import Cast, ExtractMonth, ExtractYear
+from django.db.models.lookups import YearExact, YearGt, YearGte, YearLt, YearLte
 from django.utils.encoding import force_text
 from django.utils.translation import gettext_lazy as _
 
 import ttcal
 
 from .adminforms import MonthField as MonthFormField
-from .subclassing import SubfieldBase
+from .columns import ColumnMixin
+from .subclassing import LazyFieldMixin, SubfieldBase
+
+#: Shared ttcal.Month instances, keyed on (year, month).
+_months = {}
+
+
+def get_month(year, month):
+    """Return the shared ttcal.Month instance for ``year``/``month``.
+
+       ttcal.Month builds its weeks and days when it is created, so
+       re-using one instance per distinct month makes converting large
+       querysets cheap.  The instances are shared, so they must not be
+       mutated (e.g. with ``Month.mark()``).
+    """
+    try:
+        return _months[(year, month)]
+    except KeyError:
+        return _months.setdefault((year, month), ttcal.Month(year, month))
+
+
+def clear_month_cache():
+    """Forget all shared ttcal.Month instances.
+    """
+    _months.clear()
+
+
+def month_index(month):
+    """Return the integer month index (``year * 12 + month - 1``) of
+       `month`, which is how ``MonthField(storage='int')`` stores months.
+    """
+    return month.year * 12 + month.month - 1
+
+
+def month_from_index(index):
+    """Return the (shared) ttcal.Month for the month index `index`.
+    """
+    year, month = divmod(index, 12)
+    return get_month(year, month + 1)
+
+
+def month_storage_migration(app_label, model_name, date_field, int_field):
+    """Return a migration operation that copies the months in the
+       (date storage) MonthField `date_field` to the
+       ``MonthField(storage='int')`` `int_field` of the same model.
+       The copy is done with a single UPDATE statement.
+
+       Usage::
+
+           operations = [
+               migrations.AddField('invoice', 'month_ix',
+                                   MonthField(storage='int', null=True)),
+               month_storage_migration('billing', 'invoice', 'month', 'month_ix'),
+               migrations.RemoveField('invoice', 'month'),
+               migrations.RenameField('invoice', 'month_ix', 'month'),
+           ]
+
+       The reverse operation copies the months back in batches.
+    """
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        as_date = Cast(date_field, output_field=DateField())
+        model._default_manager.using(schema_editor.connection.alias).update(**{
+            int_field: ExtractYear(as_date) * 12 + ExtractMonth(as_date) - 1
+        })
+
+    def backwards(apps, schema_editor, batch_size=2000):
+        model = apps.get_model(app_label, model_name)
+        qs = model._default_manager.using(schema_editor.connection.alias)
+        rows = qs.exclude(**{f'{int_field}__isnull': True}).only(int_field)
+        batch = []
+        for obj in rows.iterator(chunk_size=batch_size):
+            setattr(obj, date_field, getattr(obj, int_field))
+            batch.append(obj)
+            if len(batch) == batch_size:
+                qs.bulk_update(batch, [date_field])
+                batch = []
+        if batch:
+            qs.bulk_update(batch, [date_field])
+
+    return migrations.RunPython(forwards, backwards)
+
+
+class MonthIndex(Func):
+    """The month index (cf. month_index()) of a DATE column.
+    """
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        year = connection.ops.date_extract_sql('year', lhs)
+        month = connection.ops.date_extract_sql('month', lhs)
+        # EXTRACT returns double/numeric on e.g. PostgreSQL
+        db_type = self.output_field.cast_db_type(connection)
+        return f'CAST(({year} * 12 + {month} - 1) AS {db_type})', params * 2
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # sqlite stores dates as 'YYYY-MM-DD' text, and its date
+        # extraction is a python function call per row.
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return (f'(CAST(substr({lhs}, 1, 4) AS INTEGER) * 12'
+                f' + CAST(substr({lhs}, 6, 2) AS INTEGER) - 1)'), params * 2
 
 
 class Month2YearTransform(Transform):
@@ -24,9 +128,11 @@ class Month2YearTransform(Transform):
 
            MyModel.objects(my_month_field__year__gt=2022)
 
+       Comparisons with a year value are compiled to range predicates on
+       the month column (see MonthYearExact etc.), so they can use an
+       index on the column.
     """
     lookup_name = 'year'
-    function = 'YEAR'
 
     @property
     def output_field(self):
@@ -34,34 +140,132 @@ class Month2YearTransform(Transform):
 
     def as_sql(self, compiler, connection, function=None, template=None):
         lhs, lhs_params = compiler.compile(self.lhs)
-        return f'{self.function}({lhs})', lhs_params
+        if self.lhs.output_field.storage == 'int':
+            # integer division (that also works on sqlite)
+            return f'(({lhs} - ({lhs} %% 12)) / 12)', lhs_params * 2
+        return connection.ops.date_extract_sql('year', lhs), lhs_params
 
+    def as_mysql(self, compiler, connection, **extra_context):
+        if self.lhs.output_field.storage == 'int':
+            lhs, lhs_params = compiler.compile(self.lhs)
+            return f'({lhs} DIV 12)', lhs_params
+        return self.as_sql(compiler, connection, **extra_context)
 
-class MonthField(models.Field, metaclass=SubfieldBase):
+
+class MonthYearLookupMixin:
+    """Year bounds for the month column, for both storage modes.
+    """
+    def year_lookup_bounds(self, connection, year):
+        if self.lhs.lhs.output_field.storage == 'int':
+            return year * 12, year * 12 + 11
+        return connection.ops.year_lookup_bounds_for_date_field(year)
+
+
+@Month2YearTransform.register_lookup
+class MonthYearExact(MonthYearLookupMixin, YearExact):
+    pass
+
+
+@Month2YearTransform.register_lookup
+class MonthYearGt(MonthYearLookupMixin, YearGt):
+    pass
+
+
+@Month2YearTransform.register_lookup
+class MonthYearGte(MonthYearLookupMixin, YearGte):
+    pass
+
+
+@Month2YearTransform.register_lookup
+class MonthYearLt(MonthYearLookupMixin, YearLt):
+    pass
+
+
+@Month2YearTransform.register_lookup
+class MonthYearLte(MonthYearLookupMixin, YearLte):
+    pass
+
+
+class MonthField(LazyFieldMixin, ColumnMixin, models.Field, metaclass=SubfieldBase):
     """MySQL date <-> ttcal.Month() mapping.
        Maps the month to the first day of the month.
+
+       With ``storage='int'`` the month is stored as an integer month
+       index (``year * 12 + month - 1``, cf. month_index()) instead, which
+       makes conversions pure integer arithmetic.  Use
+       month_storage_migration() to convert existing DATE columns.
+
+       Besides ``__year``, the field has the range lookups ``__quarter``,
+       ``__half``, ``__fiscal_year``, ``__fiscal_quarter`` and
+       ``__between`` (cf. MonthRangeLookup).  Fiscal years start with the
+       ``fiscal_year_start`` month (default 1, i.e. January) and are named
+       by the year they start in.
+
+       export_column()/import_column() use month indexes (cf.
+       dkmodelfields.columns).
     """
     description = "A generic Month field"
+    column_typecode = 'i'
 
     def __init__(self, *args, **kwargs):
+        self.storage = kwargs.pop('storage', 'date')
+        if self.storage not in ('date', 'int'):
+            raise ValueError(f"MonthField storage must be 'date' or 'int', not {self.storage!r}")
+        self.fiscal_year_start = kwargs.pop('fiscal_year_start', 1)
+        if not 1 <= self.fiscal_year_start <= 12:
+            raise ValueError("MonthField fiscal_year_start must be in 1..12")
         super().__init__(*args, **kwargs)
         self.month_year_filter = True
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.storage != 'date':
+            kwargs['storage'] = self.storage
+        if self.fiscal_year_start != 1:
+            kwargs['fiscal_year_start'] = self.fiscal_year_start
+        return name, path, args, kwargs
+
     def db_type(self, connection):
+        if self.storage == 'int':
+            return 'INTEGER'
         return 'DATE'
 
     def from_db_value(self, value, *args):
         """Converts a value as returned by the database to a Python object.
            It is the reverse of get_prep_value().
         """
+        if isinstance(value, int):
+            return month_from_index(value)
+        if isinstance(value, datetime.date):
+            return get_month(value.year, value.month)
         return self.to_python(value)
 
+    def get_eager_db_converters(self, connection):
+        """Returns the converters the SQL compiler applies to every row of
+           a query.  The converter remembers the values it has already
+           converted, so each distinct database value is only converted
+           once per query.
+        """
+        converted = {}
+
+        def convert(value, expression, connection):
+            try:
+                return converted[value]
+            except KeyError:
+                res = converted[value] = self.from_db_value(value, expression, connection)
+                return res
+
+        return [convert]
+
     # converts python object to value that can be used in db-queries.
     def get_prep_value(self, value):
         """Convert to a value usable as a paramter in a query.
         """
         value = super().get_prep_value(value)
 
+        if self.storage == 'int':
+            return self._month_index(value)
+
         if isinstance(value, (bytes, str)):
             return value
 
@@ -109,6 +313,9 @@ class MonthField(models.Field, metaclass=SubfieldBase):
     def get_db_prep_save(self, value, connection):
         """Convert to a value suitable for saving.
         """
+        if self.storage == 'int':
+            return self._month_index(value)
+
         if isinstance(value, ttcal.Month):
             return '%04d-%02d-01' % (value.year, value.month)
 
@@ -159,23 +366,40 @@ class MonthField(models.Field, metaclass=SubfieldBase):
             return value
 
         if isinstance(value, datetime.date):
-            return ttcal.Month(value.year, value.month)
+            return get_month(value.year, value.month)
 
         if isinstance(value, (bytes, str)):
             return self._str_to_month(value)
 
+        if isinstance(value, int) and self.storage == 'int':
+            return month_from_index(value)
+
         raise ValidationError(f"Value/month: {value!r}, {type(value)!r}")
 
     # def get_db_prep_value(self, value, connection, prepared):
     #     return self.to_python(value)
 
+    def _month_index(self, value):
+        """Convert `value` to a month index (for ``storage='int'``).
+        """
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, list):
+            value = value[0]
+        if isinstance(value, (ttcal.Month, datetime.date)):
+            return month_index(value)
+        if isinstance(value, (bytes, str)):
+            value = self._str_to_month(value)
+            return None if value is None else month_index(value)
+        return value
+
     def _str_to_month(self, sval):
         # 2008-01
         if not sval.strip():
             return None  # pragma: nocover
         y = int(sval[:4])
         m = int(sval[5:7])
-        return ttcal.Month(y, m)
+        return get_month(y, m)
         
     def value_to_string(self, obj):
         """Serialization.
@@ -194,28 +418,182 @@ class MonthField(models.Field, metaclass=SubfieldBase):
         defaults.update(kwargs)
         return super().formfield(**defaults)
 
+    def column_expression(self):
+        if self.storage == 'int':
+            return super().column_expression()
+        return MonthIndex(self.attname)
+
+    def column_db_value(self, value):
+        if self.storage == 'int':
+            return value
+        year, month = divmod(value, 12)
+        return '%04d-%02d-01' % (year, month + 1)
+
+
+class MonthRangeLookup(Lookup):
+    """Base class for lookups that select a contiguous range of months.
+
+       They compile to ``col >= first AND col < after-last`` so the
+       database can do an index range scan.  Subclasses implement
+       ``month_range(value)``, returning the month indexes (cf.
+       month_index()) of the first and last month in the range.
+    """
+    prepare_rhs = False
+
+    def month_range(self, value):
+        raise NotImplementedError  # pragma: nocover
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, 'resolve_expression'):
+            raise ValueError(f"The __{self.lookup_name} lookup requires a literal value")
+        first, last = self.month_range(self.rhs)
+        field = self.lhs.output_field
+        return (field.get_prep_value(month_from_index(first)),
+                field.get_prep_value(month_from_index(last + 1)))
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f'({lhs} >= %s AND {lhs} < %s)', (
+            lhs_params + [self.rhs[0]] + lhs_params + [self.rhs[1]]
+        )
+
+    def _year_and_part(self, value, attr, count):
+        """Return (year, part) from a (year, part) pair, or from an object
+           with .year and .<attr> attributes (e.g. ttcal.Quarter).
+        """
+        if hasattr(value, attr):
+            year, part = value.year, getattr(value, attr)
+        else:
+            year, part = value
+        year, part = int(year), int(part)
+        if not 1 <= part <= count:
+            raise ValueError(f"The __{self.lookup_name} lookup requires a {attr} in 1..{count}")
+        return year, part
+
+
+@MonthField.register_lookup
+class MonthQuarter(MonthRangeLookup):
+    """``month__quarter=(2022, 3)`` (or a ttcal.Quarter).
+    """
+    lookup_name = 'quarter'
+
+    def month_range(self, value):
+        year, quarter = self._year_and_part(value, 'quarter', 4)
+        first = year * 12 + 3 * (quarter - 1)
+        return first, first + 2
+
+
+@MonthField.register_lookup
+class MonthHalf(MonthRangeLookup):
+    """``month__half=(2022, 2)``, i.e. July-December 2022.
+    """
+    lookup_name = 'half'
+
+    def month_range(self, value):
+        year, half = self._year_and_part(value, 'half', 2)
+        first = year * 12 + 6 * (half - 1)
+        return first, first + 5
+
+
+@MonthField.register_lookup
+class MonthFiscalYear(MonthRangeLookup):
+    """``month__fiscal_year=2022``, the 12 months starting with the
+       field's ``fiscal_year_start`` month in 2022.
+    """
+    lookup_name = 'fiscal_year'
+
+    def month_range(self, value):
+        first = int(value) * 12 + self.lhs.output_field.fiscal_year_start - 1
+        return first, first + 11
+
+
+@MonthField.register_lookup
+class MonthFiscalQuarter(MonthRangeLookup):
+    """``month__fiscal_quarter=(2022, 1)``, the first quarter of fiscal
+       year 2022.
+    """
+    lookup_name = 'fiscal_quarter'
+
+    def month_range(self, value):
+        year, quarter = self._year_and_part(value, 'quarter', 4)
+        first = year * 12 + self.lhs.output_field.fiscal_year_start - 1 + 3 * (quarter - 1)
+        return first, first + 2
+
+
+@MonthField.register_lookup
+class MonthBetween(MonthRangeLookup):
+    """``month__between=(first, last)``, both months included.  The
+       months can be anything MonthField.to_python() understands.
+    """
+    lookup_name = 'between'
+
+    def month_range(self, value):
+        first, last = (self.lhs.output_field.to_python(v) for v in value)
+        return month_index(first), month_index(last)
+
 
 # for admin..
 class MonthFieldYearSimpleFilter(SimpleListFilter):
+    """Admin list filter on the year of a MonthField.
+
+       The filter uses the model's first MonthField, unless a subclass sets
+       ``field_name``.  The list of years is computed by the database, and
+       cached for ``cache_ttl`` seconds (per model, field and queryset).
+    """
     title = _('år')
 
     parameter_name = 'month_year'
 
+    #: the MonthField to filter on (default: the model's first MonthField)
+    field_name = None
+
+    #: seconds to cache the list of years
+    cache_ttl = 60
+
+    # (model, field_name, sql) -> (expires, years)
+    _years_cache = {}
+
+    @classmethod
+    def clear_cache(cls):
+        cls._years_cache.clear()
+
+    def get_field_name(self, model):
+        if self.field_name:
+            return self.field_name
+        for field in model._meta.concrete_fields:
+            if isinstance(field, MonthField):
+                return field.name
+        raise ImproperlyConfigured(f"{model.__name__} has no MonthField")
+
+    def years(self, queryset):
+        """Return the sorted list of distinct years in ``queryset``.
+        """
+        name = self.get_field_name(queryset.model)
+        try:
+            key = (queryset.model._meta.label, name, str(queryset.query))
+        except EmptyResultSet:
+            return []
+        now = time.monotonic()
+        cached = self._years_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        years = queryset.order_by().values_list(f'{name}__year', flat=True).distinct()
+        years = sorted(int(y) for y in years if y is not None)
+
+        # pop(): another thread may purge the same key
+        for k, (expires, _years) in list(self._years_cache.items()):
+            if expires <= now:
+                self._years_cache.pop(k, None)
+        self._years_cache[key] = (now + self.cache_ttl, years)
+        return years
+
     def lookups(self, request, model_admin):
-        links = []
-        months = model_admin.get_queryset(
-            request
-        ).distinct().order_by(
-            'month'
-        ).values('month')
-        choices = [val['month'] for val in months]
-        choices = [v for v in choices if v is not None]
-        choices = {m.year for m in choices}
-        for val in sorted(choices):
-            links.append((str(val), val))
-        return links
+        years = self.years(model_admin.get_queryset(request))
+        return [(str(year), year) for year in years]
 
     def queryset(self, request, queryset):
         if self.value() is None:
             return queryset
-        return queryset.filter(month__year=self.value())
+        name = self.get_field_name(queryset.model)
+        return queryset.filter(**{f'{name}__year': self.value()})
@@ -1,7 +1,24 @@
 from django.core import validators
+from django.core.exceptions import ValidationError
 from django.db.models.fields import CharField
 from django.utils.translation import gettext_lazy as _
 # from south.modelsinspector import add_introspection_rules
+from .postnr import check_postnr, check_poststed, check_telefon, poststed_for
+
+
+def telefon_validator(value):
+    msg = check_telefon(value)
+    if msg:
+        raise ValidationError(msg)
+
+
+def postnr_validator(value):
+    """Validate the format, and that `value` is in the postal code
+       register (if one is configured, cf. dkmodelfields.postnr).
+    """
+    msg = check_postnr(value)
+    if msg:
+        raise ValidationError(msg)
 
 
 class TelefonField(CharField):
@@ -13,7 +30,10 @@ class TelefonField(CharField):
         kwargs['max_length'] = 8
         self.min_length = 8
         super().__init__(*args, **kwargs)
-        self.validators.append(validators.MinLengthValidator(self.min_length))
+        self.validators.extend([
+            validators.MinLengthValidator(self.min_length),
+            telefon_validator,
+        ])
 
     def deconstruct(self):  # pragma: nocover
         # not strictly necessary
@@ -48,7 +68,10 @@ class PostnrField(CharField):
         kwargs['max_length'] = 4
         self.min_length = 4
         super().__init__(*args, **kwargs)
-        self.validators.append(validators.MinLengthValidator(self.min_length))
+        self.validators.extend([
+            validators.MinLengthValidator(self.min_length),
+            postnr_validator,
+        ])
 
     def formfield(self, **kwargs):
         # should be transitioned to use the new django-localflavor package
@@ -66,15 +89,46 @@ class PostnrField(CharField):
 
 class PoststedField(CharField):
     """The name of a Norwegian zip code.
+
+       With ``postnr_field`` (the name of the model's PostnrField), and a
+       postal code register configured, the poststed is checked against
+       the postnr when the model is validated, and filled in from the
+       postnr on save when it is blank.
     """
     description = _("Norwegian zip code name")
 
     def __init__(self, *args, **kwargs):
         kwargs['max_length'] = 50
+        self.postnr_field = kwargs.pop('postnr_field', None)
         super().__init__(*args, **kwargs)
 
     def deconstruct(self):  # pragma: nocover
         # not strictly necessary
         name, path, args, kwargs = super().deconstruct()
         del kwargs['max_length']
+        if self.postnr_field is not None:
+            kwargs['postnr_field'] = self.postnr_field
         return name, path, args, kwargs
+
+    def _postnr(self, model_instance):
+        if self.postnr_field is None or model_instance is None:
+            return None
+        return getattr(model_instance, self.postnr_field, None)
+
+    def validate(self, value, model_instance):
+        super().validate(value, model_instance)
+        postnr = self._postnr(model_instance)
+        if postnr:
+            msg = check_poststed(postnr, value)
+            if msg:
+                raise ValidationError(msg)
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if not value:
+            postnr = self._postnr(model_instance)
+            poststed = poststed_for(postnr) if postnr else None
+            if poststed:
+                setattr(model_instance, self.attname, poststed)
+                return poststed
+        return value
@@ -5,15 +5,92 @@ from django.core.exceptions import ValidationError
 from django.db.models.fields import CharField
 from django.utils.translation import gettext_lazy as _
 
+#: the stored form: +<country code>.<number>[x<extension>]
+E164_RE = re.compile(r'^\+[0-9]{1,3}\.[0-9]{4,14}(?:x.+)?$')
+
+# free-form input: +47 22 33 44 55, 0047-22334455, +47.22 33 44 55 ext 12
+_PHONE_RE = re.compile(r'''
+    ^\s*(?:\+|00)\s*
+    (?P<number>[0-9][0-9\s.()/-]*?)
+    \s*(?:(?:x|ext\.?)\s*(?P<ext>\S.*?))?\s*$
+''', re.VERBOSE | re.IGNORECASE)
+_NON_DIGITS = re.compile(r'[^0-9]+')
+
+# E.164 country codes are prefix free: 1 and 7 are the only 1-digit codes,
+# these are the 2-digit codes, and all other codes have 3 digits.
+_CC2 = frozenset('''
+    20 27 30 31 32 33 34 36 39 40 41 43 44 45 46 47 48 49 51 52 53 54 55 56
+    57 58 60 61 62 63 64 65 66 81 82 84 86 90 91 92 93 94 95 98
+'''.split())
+
 
 def e164_validator(value):
-    if not re.match(r'^\+[0-9]{1,3}\.[0-9]{4,14}(?:x.+)?$', value):
+    if not E164_RE.match(value):
         raise ValidationError(
             "The phone number is not correctly formatted (e164)")
 
 
+def normalize_e164(value):
+    """Return the phone number `value` in the stored E.164 form, e.g.::
+
+           >>> normalize_e164('+47 22 33 44 55')
+           '+47.22334455'
+
+       The country code is determined from the digits unless it is
+       already separated from the number with a ``.``.  Raises
+       ValidationError if `value` isn't a valid international number.
+    """
+    if E164_RE.match(value):
+        return value
+    m = _PHONE_RE.match(value)
+    if m is None:
+        raise ValidationError(f"Not an international phone number: {value!r}")
+    number, ext = m.group('number', 'ext')
+    cc, dot, rest = number.partition('.')
+    if dot and cc.isdigit() and len(cc) <= 3:
+        number = _NON_DIGITS.sub('', rest)
+    else:
+        digits = _NON_DIGITS.sub('', number)
+        if digits[0] in '17':
+            cclen = 1
+        elif digits[:2] in _CC2:
+            cclen = 2
+        else:
+            cclen = 3
+        cc, number = digits[:cclen], digits[cclen:]
+    res = f'+{cc}.{number}' + (f'x{ext}' if ext else '')
+    if not E164_RE.match(res):
+        raise ValidationError(f"Not an international phone number: {value!r}")
+    return res
+
+
+def normalize_many(values):
+    """Normalize an iterable of phone numbers (e.g. for bulk imports).
+
+       Returns ``(normalized, errors)``, where `normalized` has one item
+       per value (None for empty or invalid values) and `errors` is a list
+       of ``(index, value, message)`` triples.  Non-string values (e.g.
+       ints from a spreadsheet) are converted with str().
+    """
+    normalized = []
+    errors = []
+    for i, value in enumerate(values):
+        if not value:
+            normalized.append(None)
+            continue
+        try:
+            normalized.append(normalize_e164(value if isinstance(value, str) else str(value)))
+        except ValidationError as e:
+            normalized.append(None)
+            errors.append((i, value, e.messages[0]))
+    return normalized, errors
+
+
 class TelephoneField(CharField):
     """International phone number corresponding to E.164.
+
+       Values are normalized to the ``+47.22334455`` form when possible
+       (cf. normalize_e164()).
     """
     description = _("International phone number")
 
@@ -30,3 +107,15 @@ class TelephoneField(CharField):
         name, path, args, kwargs = super().deconstruct()
         del kwargs['max_length']
         return name, path, args, kwargs
+
+    def to_python(self, value):
+        """Normalize `value`.  Values that can't be normalized are returned
+           unchanged (and reported by the validators).
+        """
+        value = super().to_python(value)
+        if value:
+            try:
+                return normalize_e164(value)
+            except ValidationError:
+                pass
+        return value
@@ -0,0 +1,169 @@
+"""
+Norwegian postal code register (postnr -> poststed).
+
+The register is read from Posten/Bring's ``Postnummerregister`` file
+(tab separated: postnr, poststed, kommunenr, kommune, kategori).  The
+register changes several times a year, so it is not bundled: point
+``settings.DKMODELFIELDS_POSTNR_REGISTER`` at a downloaded copy (it is
+loaded on first use), or call ``load_register(path)``.
+
+The register is stored as an ``array('H')`` indexed by the postal code,
+holding indexes into a tuple of the distinct poststed names (~20KB), so
+lookups are O(1) and need no per-row objects.
+"""
+from array import array
+
+from django.conf import settings
+
+_register = None
+
+
+class PostnrRegister:
+    """Mapping of 4 digit postal codes to poststed names.
+    """
+    def __init__(self, rows):
+        """`rows` is an iterable of (postnr, poststed) pairs.
+        """
+        names = {}
+        self._index = array('H', bytes(2 * 10000))   # 0 = not in register
+        for postnr, poststed in rows:
+            ix = names.setdefault(poststed, len(names) + 1)
+            self._index[int(postnr)] = ix
+        self._names = (None,) + tuple(names)
+
+    @classmethod
+    def from_file(cls, fname):
+        """Read a Postnummerregister file (utf-8 or Posten's "ansi", i.e.
+           cp1252, encoding).
+        """
+        with open(fname, 'rb') as fp:
+            data = fp.read()
+        try:
+            txt = data.decode('utf-8')
+        except UnicodeDecodeError:
+            txt = data.decode('cp1252')
+        return cls(line.split('\t')[:2] for line in txt.splitlines() if line.strip())
+
+    def poststed(self, postnr):
+        """Return the poststed for `postnr` (None if it isn't registered).
+        """
+        if not _digits(postnr, 4):
+            return None
+        return self._names[self._index[int(postnr)]]
+
+    def __contains__(self, postnr):
+        return self.poststed(postnr) is not None
+
+    def __len__(self):
+        return sum(1 for ix in self._index if ix)
+
+
+def _digits(value, n):
+    """Is `value` a string of `n` digits?
+    """
+    return isinstance(value, str) and len(value) == n and value.isdigit()
+
+
+def load_register(fname):
+    """Load (and use) the register in the file `fname`.
+    """
+    global _register  # pylint:disable=W0603
+    _register = PostnrRegister.from_file(fname)
+    return _register
+
+
+def get_register():
+    """Return the register, loading ``settings.DKMODELFIELDS_POSTNR_REGISTER``
+       on first use.  Returns None if no register is configured.
+    """
+    if _register is None:
+        fname = getattr(settings, 'DKMODELFIELDS_POSTNR_REGISTER', None)
+        if fname:
+            return load_register(fname)
+    return _register
+
+
+def set_register(register):
+    """Use `register` (a PostnrRegister, or None to unset it).
+    """
+    global _register  # pylint:disable=W0603
+    _register = register
+
+
+def poststed_for(postnr):
+    """Return the poststed for `postnr`, or None (also when there is no
+       register).
+    """
+    register = get_register()
+    return register.poststed(postnr) if register is not None else None
+
+
+def check_postnr(postnr):
+    """Return an error message for `postnr`, or None if it is valid.
+    """
+    if not _digits(postnr, 4):
+        return "Postnummer må være 4 siffer"
+    register = get_register()
+    if register is not None and postnr not in register:
+        return f"Ukjent postnummer: {postnr}"
+    return None
+
+
+def check_poststed(postnr, poststed):
+    """Return an error message if `poststed` doesn't match the registered
+       poststed for `postnr`, or None.  (Case is not significant.)
+    """
+    expected = poststed_for(postnr)
+    if expected is None or not poststed:
+        return None
+    if not isinstance(poststed, str):
+        return f"Ugyldig poststed: {poststed!r}"
+    if poststed.upper() != expected.upper():
+        return f"Poststed for {postnr} er {expected}, ikke {poststed}"
+    return None
+
+
+def check_telefon(telefon):
+    """Return an error message for a Norwegian phone number, or None.
+    """
+    if not _digits(telefon, 8):
+        return "Telefonnummer må være 8 siffer"
+    return None
+
+
+def validate_addresses(rows):
+    """Validate an iterable of (postnr, poststed) pairs, e.g. a bulk import.
+       `poststed` can be None/empty to only check the postnr.
+
+       Returns a list of ``(index, message)`` for the invalid rows (also
+       for values that aren't strings, e.g. None or ints).
+    """
+    register = get_register()
+    poststed = register.poststed if register is not None else None
+    errors = []
+    for i, (pnr, sted) in enumerate(rows):
+        # fast path for valid rows, the messages come from the check_*()
+        # functions.
+        if poststed is not None:
+            expected = poststed(pnr)
+            if expected is not None and (
+                    not sted or (isinstance(sted, str) and sted.upper() == expected.upper())):
+                continue
+        elif _digits(pnr, 4):
+            continue
+        msg = check_postnr(pnr) or check_poststed(pnr, sted)
+        if msg is not None:
+            errors.append((i, msg))
+    return errors
+
+
+def validate_telefon_many(values):
+    """Validate an iterable of Norwegian phone numbers.
+       Returns a list of ``(index, message)`` for the invalid values.
+    """
+    errors = []
+    for i, v in enumerate(values):
+        msg = check_telefon(v)
+        if msg is not None:
+            errors.append((i, msg))
+    return errors
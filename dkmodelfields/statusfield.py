@@ -1,23 +1,66 @@
 import re
-from collections import defaultdict
+import warnings
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
 
 from builtins import str as text
 from django.core import validators
+from django.core.exceptions import EmptyResultSet
 from django.db import models
+from django.db.models import CharField, Lookup, Transform
+from django.db.models.lookups import In
 from django.forms import ChoiceField
 from django.utils.translation import gettext_lazy as _
 from dk.collections import pset
-from .subclassing import SubfieldBase
+from .subclassing import LazyFieldMixin, SubfieldBase
+
+
+#: A line of a StatusDef that couldn't be parsed (lineno is 1-based).
+ParseError = namedtuple('ParseError', 'lineno line')
 
 
 class StatusValue:
-    def __init__(self, name=None, verbose=None, categories=()):
-        self.name = name.strip()
-        self.verbose = verbose.strip()
+    """An (immutable) status value.
+
+       Status values compare equal to, and hash like, their name, so they
+       can be compared with (and used in sets/dicts together with) plain
+       strings.
+
+       ``mask`` has the bits of the status' categories set (the bit
+       positions are assigned by the StatusDef), and ``code`` is the
+       status' integer code (None if the definition has no codes).
+    """
+    __slots__ = ('name', 'verbose', 'categories', 'mask', 'code', '_hash')
+
+    def __init__(self, name=None, verbose=None, categories=(), mask=0, code=None):
         if isinstance(categories, (bytes, text)):
-            self.categories = re.split(r'[,\s]+', categories)
-        else:
-            self.categories = categories
+            categories = re.split(r'[,\s]+', categories)
+        setattr_ = super().__setattr__
+        setattr_('name', name.strip())
+        setattr_('verbose', verbose.strip())
+        setattr_('categories', tuple(categories))
+        setattr_('mask', mask)
+        setattr_('code', code)
+        setattr_('_hash', hash(self.name))
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, attr):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return StatusValue, (self.name, self.verbose, self.categories, self.mask, self.code)
+
+    def __eq__(self, other):
+        if isinstance(other, StatusValue):
+            return self is other or self.name == other.name
+        if isinstance(other, text):
+            return self.name == other
+        return NotImplemented
+
+    def __hash__(self):
+        return self._hash
 
     def __len__(self):   # needed due to the maxlength validator
         return len(self.name)
@@ -32,11 +75,14 @@ class StatusValue:
             self.name, self.verbose, self.categories)
 
     def __json__(self):
-        return dict(
+        res = dict(
             name=self.name,
             verbose=self.verbose,
-            categories=self.categories
+            categories=list(self.categories)
         )
+        if self.code is not None:
+            res['code'] = self.code
+        return res
 
 
 class StatusDef:
@@ -66,11 +112,26 @@ class StatusDef:
                status = models.CharField(max_length=10,  # max length of status
                                          choices=STATUSDEF.options)
 
+       The table can start with a column of (unique) integer codes::
+
+                    ==== =========== ========================= ==========
+                    code status      verbose explanation       category
+                    ==== =========== ========================= ==========
+                    1    ok          Ny Bestilling             # [init]
+                    5    hentet      Kort trykkes              # [done]
+                    ==== =========== ========================= ==========
+
+       which is required by ``StatusField(storage='int')``.  The codes are
+       what is stored, so they must not be changed (statuses can be
+       re-ordered and added freely).  ``by_code`` maps codes to statuses.
+
        @something and @something-else can be used with the sphinx
        `include <http://docutils.sourceforge.net/docs/ref/rst/directives.html#include>`_
        directive's :start-after: and :end-before: options.
 
-       Empty lines, and lines starting with `@` are disregarded.
+       Empty lines, and lines starting with `@` are disregarded.  Other
+       lines that can't be parsed are recorded in ``.errors`` (a list of
+       ``ParseError(lineno, line)``), and a warning is issued.
 
        You are not required to format the string as a rst table, but it seems
        foolish not to do so.
@@ -79,56 +140,90 @@ class StatusDef:
 
     # TODO:  create a custom model field that maps to <select>
 
-    defre = re.compile('''
-    \\s*(?P<name>[a-z][-a-z0-9]*)\\s*(?P<verbose>[^#]*)\\#\\s*\\[(?P<categories>[^\\]]*)\\]
-    ''', re.VERBOSE)
-
-    # noinspection PyMethodMayBeStatic
-    def _parse(self, txt):
-        lines = [line for line in txt.split('\n') if line.strip()]
-        defs = pset()
-
-        in_header = False  # a state-machine...
+    # one match per line: a table rule, an @-line, a status definition,
+    # or (anything else) an error.  ([^\S\n] is whitespace except newline.)
+    defre = re.compile(r'''
+        ^[^\S\n]*
+        (?:
+            (?P<rule>=[^\n]*)
+          | @[^\n]*
+          | (?:(?P<code>[0-9]+)[^\S\n]+)?
+            (?P<name>[a-z][-a-z0-9]*)[^\S\n]*
+            (?P<verbose>[^\#\n]*)\#[^\S\n]*\[(?P<categories>[^\]\n]*)\][^\n]*
+          | (?P<error>[^\n]*?)
+        )
+        [^\S\n]*$
+    ''', re.VERBOSE | re.MULTILINE)
 
-        for line in lines:
-            line = line.strip()
+    catsplit = re.compile(r'[,\s]+')
 
-            # skip header lines
-            if in_header and not line.startswith('='):
-                continue
-            if line.startswith('@'):
-                continue
-            if line.startswith('=') and not in_header:
-                in_header = True
-                continue
-            if line.startswith('=') and in_header:
-                in_header = False
+    def _parse(self, txt):
+        defs = {}
+        catbit = self._catbit
+        split = StatusDef.catsplit.split
+
+        in_header = False  # between the first two rules of a table
+
+        for m in StatusDef.defre.finditer(txt):
+            rule, code, name, verbose, categories, error = m.group(
+                'rule', 'code', 'name', 'verbose', 'categories', 'error')
+            if rule is not None:
+                in_header = not in_header
+            elif in_header:
                 continue
-
-            m = StatusDef.defre.match(line)
-            if m:
-                gdict = pset((str(k), v)
-                             for (k, v) in m.groupdict().items())
-                sval = StatusValue(name=gdict.name,
-                                   verbose=gdict.verbose,
-                                   categories=gdict.categories)
-                defs[sval.name] = sval
-            else:  # pragma: nocover
-                print('error parsing:', repr(line))
-
-        return defs
+            elif name is not None:
+                categories = split(categories)
+                mask = 0
+                for cat in categories:
+                    # new categories get the next free bit
+                    mask |= catbit.setdefault(cat, 1 << len(catbit))
+                defs[name] = StatusValue(name=name,
+                                         verbose=verbose,
+                                         categories=categories,
+                                         mask=mask,
+                                         code=None if code is None else int(code))
+            elif error:
+                lineno = txt.count('\n', 0, m.start()) + 1
+                self.errors.append(ParseError(lineno, error))
+                warnings.warn(
+                    f'StatusDef: cannot parse line {lineno}: {error!r}',
+                    stacklevel=3
+                )
+
+        # (pset's insert is linear in its size, but status definitions are
+        # only parsed once per process, cf. get_statusdef())
+        return pset(defs)
 
     def __init__(self, txt):
+        self._catbit = {}  # category -> bit, filled in by _parse
+        self.errors = []   # ParseErrors for lines that couldn't be parsed
         self.status = self._parse(txt)
         self._defs = self.status.values()
-        self._categories = set()
-        for d in self._defs:
-            for cat in d.categories:
-                self._categories.add(cat)
         self._cat2status = defaultdict(set)
+        cat2names = defaultdict(list)
         for d in self._defs:
             for cat in d.categories:
                 self._cat2status[cat].add(d)
+                cat2names[cat].append(d.name)
+        self._categories = set(self._cat2status)
+        # category -> names of its statuses, in definition order
+        self._cat2names = {cat: tuple(names) for cat, names in cat2names.items()}
+        # category -> names of the statuses it is the (first) category of
+        cat2primary = defaultdict(list)
+        for d in self._defs:
+            if d.categories:
+                cat2primary[d.categories[0]].append(d.name)
+        self._cat2primary = {cat: tuple(names) for cat, names in cat2primary.items()}
+        self._expanded = {}  # memo for expand()
+        self.by_code = {}
+        for d in self._defs:
+            if d.code is not None:
+                if d.code in self.by_code:
+                    raise ValueError(
+                        f"StatusDef: {d.name!r} and {self.by_code[d.code].name!r}"
+                        f" have the same code ({d.code})"
+                    )
+                self.by_code[d.code] = d
 
     @property
     def namelength(self):
@@ -150,11 +245,104 @@ class StatusDef:
         """
         return self.status[status].categories
 
+    def mask_for(self, *categories):
+        """Return the bitmask for `categories`, e.g.::
+
+               mask = statusdef.mask_for('init', 'err')
+               if statusvalue.mask & mask: ...
+
+        """
+        mask = 0
+        for cat in categories:
+            mask |= self._catbit[cat]
+        return mask
+
+    def in_category(self, status, category):
+        """Does `status` belong to `category`?
+
+           `category` can also be a mask from mask_for(), to check
+           membership in any of several categories.  `status` can be a
+           status name, StatusValue or code.  Raises ValueError if
+           `status` isn't defined.
+        """
+        if not isinstance(category, int):
+            category = self._catbit[category]
+        if isinstance(status, int):
+            value = self.by_code.get(status)
+        else:
+            # not self.status[..], pset treats int keys as positions
+            value = dict.get(self.status, status)
+        if value is None:
+            raise ValueError(f"Unknown status: {status!r}")
+        return bool(value.mask & category)
+
     def category2status(self, category):
         """Return all statuses belonging to `category`.
         """
         return self._cat2status[category]
 
+    def category_names(self, primary=False):
+        """Return a (read-only) mapping of category -> names of its
+           statuses (in definition order).
+
+           With ``primary=True`` a status is only listed under its first
+           category (cf. category()), and categories that are not the
+           first category of any status are left out.
+        """
+        return MappingProxyType(self._cat2primary if primary else self._cat2names)
+
+    def expand(self, values):
+        """Return a tuple of the status names in `values`, where category
+           names are replaced by the names of the statuses they contain
+           (and status codes by the status names).
+
+           Raises ValueError for values that are neither a status nor a
+           category.
+        """
+        key = tuple(values)
+        try:
+            return self._expanded[key]
+        except (KeyError, TypeError):
+            pass
+
+        names = []
+        for v in key:
+            if isinstance(v, bytes):
+                v = str(v, 'utf-8')
+            elif isinstance(v, StatusValue):
+                v = v.name
+            elif isinstance(v, int) and v in self.by_code:
+                v = self.by_code[v].name
+            if v in self._cat2names:
+                names.extend(self._cat2names[v])
+            elif v is None or hasattr(v, 'resolve_expression') or v in self.status:
+                names.append(v)
+            else:
+                raise ValueError(f"Unknown status: {v!r}")
+        res = tuple(dict.fromkeys(names))  # unique, keeping order
+
+        if len(self._expanded) < 1024:
+            try:
+                self._expanded[key] = res
+            except TypeError:  # pragma: nocover
+                pass
+        return res
+
+    def expand_codes(self, values):
+        """Like expand(), but returns the codes of the statuses.
+        """
+        status = self.status
+        return tuple(
+            status[v].code if isinstance(v, text) else v
+            for v in self.expand(values)
+        )
+
+    @property
+    def has_codes(self):
+        """Do all statuses have a code?
+        """
+        return len(self.by_code) == len(self._defs)
+
     def valid_status(self, s):
         """Is `s` a well-defined status value?
         """
@@ -168,14 +356,45 @@ class StatusDef:
         return [(name, gdict.verbose) for name, gdict in self.status]
 
 
-class StatusField(models.Field, metaclass=SubfieldBase):
+#: parsed StatusDefs, keyed on their definition text.
+_statusdefs = {}
+
+
+def get_statusdef(txt):
+    """Return the StatusDef for the definition `txt`.
+
+       Definitions are only parsed once per process (StatusFields are
+       re-created for every historical model state in migrations), so the
+       returned StatusDef is shared and must not be modified.
+    """
+    try:
+        return _statusdefs[txt]
+    except KeyError:
+        return _statusdefs.setdefault(txt, StatusDef(txt))
+
+
+def clear_statusdef_cache():
+    """Forget all StatusDefs parsed by get_statusdef().
+    """
+    _statusdefs.clear()
+
+
+class StatusField(LazyFieldMixin, models.Field, metaclass=SubfieldBase):
     """Character status field.
+
+       With ``storage='int'`` the statuses' integer codes (cf. StatusDef)
+       are stored in a SMALLINT column instead of the names.
     """
     description = _("Status field")
 
     def __init__(self, *args, **kw):
         self.txt = args[0] if args else ""
-        self.statusdef = StatusDef(self.txt)
+        self.storage = kw.pop('storage', 'name')
+        self.statusdef = get_statusdef(self.txt)
+        if self.storage not in ('name', 'int'):
+            raise ValueError(f"storage must be 'name' or 'int', not {self.storage!r}")
+        if self.storage == 'int' and not self.statusdef.has_codes:
+            raise ValueError("storage='int' requires a code for every status")
         self.max_length = kw['max_length'] = kw.get('max_length', self.statusdef.namelength)
         super().__init__(**kw)
         self.validators.append(validators.MaxLengthValidator(self.max_length))
@@ -183,6 +402,8 @@ class StatusField(models.Field, metaclass=SubfieldBase):
     def deconstruct(self):
         name, path, args, kwargs = super().deconstruct()
         kwargs['choices'] = self.statusdef.options
+        if self.storage != 'name':
+            kwargs['storage'] = self.storage
         return name, path, [self.txt], kwargs
 
     def from_db_value(self, value, *args):
@@ -195,6 +416,13 @@ class StatusField(models.Field, metaclass=SubfieldBase):
         """Converts the input ``value`` into a StatusValue instance,
            raising ValueError if the data can't be converted.
         """
+        # before the emptiness check, 0 is a valid code
+        if isinstance(value, int) and self.storage == 'int':
+            try:
+                return self.statusdef.by_code[value]
+            except KeyError:
+                raise ValueError(f"Unknown status code: {value!r}") from None
+
         if not value:
             return None
 
@@ -214,28 +442,21 @@ class StatusField(models.Field, metaclass=SubfieldBase):
         return "StatusField"
 
     def db_type(self, connection):
+        if self.storage == 'int':
+            return 'SMALLINT'
         return f'VARCHAR({self.max_length})'
 
     def get_prep_lookup(self, lookup_type, value):
         """Return a value prepared for database lookup.
         """
         if lookup_type == 'in':
-            res = set()
-            if isinstance(value, (bytes, text)):
-                if self.statusdef.is_category(value):
-                    res |= self.statusdef.category2status(value)
-                else:
-                    res.add(value)
-            elif value is None:
+            if value is None:
                 return [self.get_prep_value(None)]
-            else:
-                for v in value:
-                    if self.statusdef.is_category(v):
-                        res |= self.statusdef.category2status(v)
-                    else:
-                        res.add(v)
-            res = [self.get_prep_value(v) for v in res]
-            return res
+            if isinstance(value, (bytes, text)):
+                value = [value]
+            if self.storage == 'int':
+                return list(self.statusdef.expand_codes(value))
+            return list(self.statusdef.expand(value))
         
         if lookup_type == 'exact':
             return value
@@ -247,6 +468,10 @@ class StatusField(models.Field, metaclass=SubfieldBase):
         """
         if value is None:
             return value
+        if self.storage == 'int':
+            if isinstance(value, int):
+                return value
+            return self.to_python(value).code
         return self.to_python(value).name
 
     def formfield(self, **kwargs):
@@ -259,3 +484,98 @@ class StatusField(models.Field, metaclass=SubfieldBase):
         }
         defaults.update(kwargs)
         return super().formfield(**defaults)
+
+
+@StatusField.register_lookup
+class StatusIn(In):
+    """``status__in`` lookup that also accepts category names, e.g.
+       ``MyModel.objects.filter(status__in=['init', 'err'])``.
+    """
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, 'resolve_expression'):
+            return super().get_prep_lookup()
+        return self.lhs.output_field.get_prep_lookup('in', self.rhs)
+
+
+@StatusField.register_lookup
+class StatusCategory(Transform):
+    """``status__category`` is the category of the status (the first one
+       if it has several), computed by the database with a CASE
+       expression, e.g.::
+
+           MyModel.objects.values('status__category').annotate(n=Count('id'))
+
+       Filtering (``status__category='done'``, ``status__category__in=[..]``)
+       matches the statuses whose (first) category is one of the
+       categories, i.e. the same rows as filtering on the annotated value,
+       and is compiled to ``status IN (...)`` so it can use an index on
+       the column.  (Use ``status__in=['done']`` to match all statuses
+       that have the category.)
+    """
+    lookup_name = 'category'
+
+    @property
+    def output_field(self):
+        return CharField()
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = compiler.compile(self.lhs)
+        field = self.lhs.output_field
+        whens = []
+        params = []
+        for category, names in field.statusdef.category_names(primary=True).items():
+            placeholders = ', '.join(['%s'] * len(names))
+            whens.append(f'WHEN {lhs} IN ({placeholders}) THEN %s')
+            params += lhs_params
+            params += [field.get_prep_value(name) for name in names]
+            params.append(category)
+        if not whens:
+            return 'NULL', []
+        return f'CASE {" ".join(whens)} ELSE NULL END', params
+
+
+class StatusCategoryLookup(Lookup):
+    """Base class for the lookups on StatusCategory.  They bypass the CASE
+       expression and compare the status column with the statuses of the
+       categories.
+    """
+    prepare_rhs = False
+
+    def categories(self):
+        raise NotImplementedError  # pragma: nocover
+
+    def as_sql(self, compiler, connection):
+        col = self.lhs.lhs
+        field = col.output_field
+        statusdef = field.statusdef
+        cat2names = statusdef.category_names(primary=True)
+        names = []
+        for category in self.categories():
+            if not statusdef.is_category(category):
+                raise ValueError(f"Unknown status category: {category!r}")
+            names.extend(cat2names.get(category, ()))
+        if not names:
+            raise EmptyResultSet
+        names = list(dict.fromkeys(names))
+        lhs, params = compiler.compile(col)
+        placeholders = ', '.join(['%s'] * len(names))
+        return (f'{lhs} IN ({placeholders})',
+                params + [field.get_prep_value(name) for name in names])
+
+
+@StatusCategory.register_lookup
+class StatusCategoryExact(StatusCategoryLookup):
+    lookup_name = 'exact'
+
+    def categories(self):
+        return [self.rhs]
+
+
+@StatusCategory.register_lookup
+class StatusCategoryIn(StatusCategoryLookup):
+    lookup_name = 'in'
+
+    def categories(self):
+        if isinstance(self.rhs, (bytes, text)):
+            return [self.rhs]
+        return list(self.rhs)
@@ -4,6 +4,10 @@ backwards compatibility utilities.
 Add SubfieldBase as the metaclass for your Field subclass, implement
 to_python() and the other necessary methods and everything will work
 seamlessly.
+
+If the field has a true ``lazy`` attribute, values are converted the first
+time they are read instead of when they are assigned (see LazyCreator).
+Fields get the ``lazy=True`` option from LazyFieldMixin.
 """
 
 
@@ -20,6 +24,13 @@ class SubfieldBase(type):
         return new_class
 
 
+def unconverted_key(field):
+    """The ``obj.__dict__`` key marking that the value of the lazy `field`
+       has not been converted yet (cf. LazyCreator).
+    """
+    return f'_{field.name}_unconverted'
+
+
 class Creator:
     """
     A placeholder class that provides a way to set the attribute on the model.
@@ -36,6 +47,59 @@ class Creator:
         obj.__dict__[self.field.name] = self.field.to_python(value)
 
 
+class LazyCreator(Creator):
+    """
+    Like Creator, but stores the value exactly as it is assigned and only
+    converts it with ``field.to_python()`` the first time the attribute is
+    read.  The converted value replaces the raw value in ``obj.__dict__``.
+    """
+    def __init__(self, field):
+        super().__init__(field)
+        # __dict__ key marking that the stored value is not converted yet
+        self.pending = unconverted_key(field)
+
+    def __get__(self, obj, type=None):
+        if obj is None:
+            return self
+        if self.pending in obj.__dict__:
+            obj.__dict__[self.field.name] = self.field.to_python(
+                obj.__dict__[self.field.name]
+            )
+            del obj.__dict__[self.pending]
+        return obj.__dict__[self.field.name]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.field.name] = value
+        obj.__dict__[self.pending] = True
+
+
+class LazyFieldMixin:
+    """Adds the ``lazy`` option to a SubfieldBase field.
+
+       With ``lazy=True`` values loaded from the database are converted
+       the first time they are read (querysets using ``.values()`` will
+       then return the raw database values).  This only changes when
+       values are converted, so ``lazy`` is not part of deconstruct() and
+       toggling it needs no migration.
+
+       Fields that need other converters than Django's default override
+       get_eager_db_converters().
+    """
+    def __init__(self, *args, lazy=False, **kwargs):
+        self.lazy = lazy
+        super().__init__(*args, **kwargs)
+
+    def get_db_converters(self, connection):
+        if self.lazy:
+            return []  # converted on first access (LazyCreator)
+        return self.get_eager_db_converters(connection)
+
+    def get_eager_db_converters(self, connection):
+        """The converters used when the field is not lazy.
+        """
+        return super().get_db_converters(connection)
+
+
 def make_contrib(superclass, func=None):
     """
     Returns a suitable contribute_to_class() method for the Field subclass.
@@ -49,6 +113,7 @@ def make_contrib(superclass, func=None):
             func(self, cls, name, **kwargs)
         else:
             super(superclass, self).contribute_to_class(cls, name, **kwargs)
-        setattr(cls, self.name, Creator(self))
+        descriptor = LazyCreator if getattr(self, 'lazy', False) else Creator
+        setattr(cls, self.name, descriptor(self))
 
     return contribute_to_class
@@ -5,6 +5,35 @@ import re
 from datetime import timedelta
 
 
+# the output of str(timedelta), e.g. ``3:04:05``, ``2 days, 3:04:05.250000``
+# or ``-1 day, 23:59:59.995000``
+_TIMEDELTA_STR = re.compile(r'(?:(-?\d+) days?, )?(\d+):(\d\d):(\d\d)(?:\.(\d{6}))?$')
+
+# str() of a negative timedelta (only the days are negative)
+_NEGATIVE_DAYS = re.compile(r'-\d+ days?, ')
+
+_TIME_MATCHER = re.compile(r"""
+    (?:
+        (?P<weeks>\d+)
+        \W*
+        (?:weeks?|w),?
+    )?
+    \W*
+    (?:
+        (?P<days>\d+)
+        \W*
+        (?:days?|d),?
+    )?
+    \W*
+    (?:
+        (?P<hours>\d+):
+        (?P<minutes>\d+)
+        (?::(?P<seconds>\d+)
+        (?:\.(?P<microseconds>\d+))?)?
+    )?
+    """, re.VERBOSE)
+
+
 def xstr_to_timedelta(td_str):
     """Returns a timedelta parsed from the native string output of a timedelta.
 
@@ -15,31 +44,27 @@ def xstr_to_timedelta(td_str):
        Additionally will handle user input in months and years,
        translating those bits into a count of days which is 'close
        enough'.
+
+       A leading ``-`` (e.g. ``-0:00:05``, as written by ttcal.Duration)
+       negates the duration.
     """
     if not td_str:
         return None
+    if td_str[0] == '-' and not _NEGATIVE_DAYS.match(td_str):
+        return -(xstr_to_timedelta(td_str[1:]) or timedelta(0))
 
-    time_matcher = re.compile(r"""
-        (?:
-            (?P<weeks>\d+)
-            \W*
-            (?:weeks?|w),?
-        )?
-        \W*
-        (?:
-            (?P<days>\d+)
-            \W*
-            (?:days?|d),?
-        )?
-        \W*
-        (?:
-            (?P<hours>\d+):
-            (?P<minutes>\d+)
-            (?::(?P<seconds>\d+)
-            (?:\.(?P<microseconds>\d+))?)?
-        )?
-        """, re.VERBOSE)
-    time_matches = time_matcher.match(td_str)
+    # str(timedelta) ends in ``:SS`` or ``:SS.ffffff``
+    m = None
+    if td_str[-3:-2] == ':' or td_str[-10:-9] == ':':
+        m = _TIMEDELTA_STR.match(td_str)
+    if m is not None:
+        days, hours, minutes, seconds, us = m.groups()
+        return timedelta(
+            int(days) if days else 0,
+            int(hours) * 3600 + int(minutes) * 60 + int(seconds),
+            int(us) if us else 0)
+
+    time_matches = _TIME_MATCHER.match(td_str)
     time_groups = {k: int(v or '0') for k, v in time_matches.groupdict().items()}
     time_groups["days"] += time_groups["weeks"] * 7
 
@@ -51,3 +76,12 @@ def xstr_to_timedelta(td_str):
         microseconds=time_groups["microseconds"])
 
     return res
+
+
+def parse_many(values):
+    """Generator version of xstr_to_timedelta() for large iterables (e.g.
+       fixture or JSON dumps).
+    """
+    parse = xstr_to_timedelta
+    for td_str in values:
+        yield parse(td_str)
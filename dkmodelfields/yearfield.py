@@ -3,21 +3,70 @@ A database field class that goes with ttcal.Year.
 """
 # pylint:disable=R0904
 from django.db import models
+from django.db.models import Lookup
 
 import ttcal
 
 from .adminforms import YearField as YearFormField
-from .subclassing import SubfieldBase
+from .columns import ColumnMixin
+from .subclassing import LazyFieldMixin, SubfieldBase
 
+#: the years [start, end) that get_year() keeps shared instances of
+YEAR_CACHE_RANGE = (1900, 2100)
+_years = [None] * (YEAR_CACHE_RANGE[1] - YEAR_CACHE_RANGE[0])
 
-class YearField(models.Field, metaclass=SubfieldBase):
+
+def get_year(year):
+    """Return the shared ttcal.Year instance for `year` (a new instance
+       for years outside YEAR_CACHE_RANGE).
+
+       ttcal.Year builds all its months when it is created, so this makes
+       converting large querysets cheap.  The instances are shared, so
+       they must not be mutated.
+    """
+    ix = year - YEAR_CACHE_RANGE[0]
+    if 0 <= ix < len(_years):
+        res = _years[ix]
+        if res is None:
+            res = _years[ix] = ttcal.Year(year)
+        return res
+    return ttcal.Year(year)
+
+
+def clear_year_cache():
+    """Forget all shared ttcal.Year instances.
+    """
+    _years[:] = [None] * len(_years)
+
+
+class YearField(LazyFieldMixin, ColumnMixin, models.Field, metaclass=SubfieldBase):
     """MySQL YEAR(4) <-> ttcal.Year() mapping.
+
+       With ``storage='smallint'`` the year is stored in a SMALLINT
+       column, which works the same on all backends.
+
+       Besides the usual comparisons (and ``__range``), the field has a
+       ``__decade`` lookup (cf. YearDecade).
     """
+    column_typecode = 'i'
 
     def __init__(self, *args, **kwargs):
+        self.storage = kwargs.pop('storage', 'year')
+        if self.storage not in ('year', 'smallint'):
+            raise ValueError(
+                f"storage must be 'year' or 'smallint', not {self.storage!r}"
+            )
         super().__init__(*args, **kwargs)
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.storage != 'year':
+            kwargs['storage'] = self.storage
+        return name, path, args, kwargs
+
     def db_type(self, connection):
+        if self.storage == 'smallint':
+            return 'SMALLINT'
         return 'YEAR(4)'
 
     def from_db_value(self, value, *args):
@@ -31,7 +80,7 @@ class YearField(models.Field, metaclass=SubfieldBase):
             return None
         
         if isinstance(value, int):
-            return ttcal.Year(value)
+            return get_year(value)
 
         return value
 
@@ -65,3 +114,19 @@ class YearField(models.Field, metaclass=SubfieldBase):
             return ""
         val = self.value_from_object(obj)
         return self.get_prep_value(val)
+
+
+@YearField.register_lookup
+class YearDecade(Lookup):
+    """``yr__decade=1990`` matches the years 1990-1999 (any year in the
+       decade can be given).  Compiled to a range predicate, so it can use
+       an index on the column.
+    """
+    lookup_name = 'decade'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        year = self.rhs.year if isinstance(self.rhs, ttcal.Year) else int(self.rhs)
+        start = year - year % 10
+        return f'({lhs} >= %s AND {lhs} < %s)', lhs_params + [start, start + 10]
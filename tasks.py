@@ -145,10 +145,23 @@ def watch(ctx):
     watcher.start()
 
 
+@task
+def bench(ctx, k='', rows='10000,100000,1000000', output='bench.json', compare=None):
+    """Run the field conversion benchmarks (results are written as json).
+    """
+    cmd = f'python -m tests.benchmarks --rows {rows} -o {output}'
+    if k:
+        cmd += f' -k {k}'
+    if compare:
+        cmd += f' --compare {compare}'
+    ctx.run(cmd)
+
+
 # individual tasks that can be run from this project
 ns = Collection(
     build,
     watch,
+    bench,
     build_js,
     lessc,
     doctools,
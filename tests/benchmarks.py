@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the conversion hot paths of the dkmodelfields fields.
+
+Usage (from the package root)::
+
+    python -m tests.benchmarks                         # everything
+    python -m tests.benchmarks -k MonthField           # name filter
+    python -m tests.benchmarks --rows 10000 -o new.json
+    python -m tests.benchmarks --compare old.json -o new.json
+
+The results are written as JSON (to stdout, or the --output file), and
+``--compare`` reports the change in ops/sec against an earlier run, so
+regressions between releases can be spotted.
+
+New benchmarks are added with the ``@benchmark(name)`` decorator.  The
+decorated function returns a ``(callable, ops)`` tuple, where ``callable``
+performs ``ops`` operations each time it is called.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+DIRNAME = os.path.dirname(__file__)
+
+#: number of values converted per round in the field benchmarks
+N = 10000
+
+#: row counts used by the save/load round trip benchmarks
+ROWS = (10000, 100000, 1000000)
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark under ``name``.
+    """
+    def decorator(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return decorator
+
+
+def setup_django():
+    """Configure Django with the test app and an in-memory sqlite db.
+    """
+    sys.path.append(DIRNAME)
+    import django
+    from django.conf import settings
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='benchmark',
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        },
+        INSTALLED_APPS=(
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'django.contrib.admin',
+            'dkmodelfields',
+            'testapp_dkmodelfields',
+        ),
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', interactive=False, verbosity=0)
+
+
+def field_cases():
+    """Return ``{fieldname: (model, attribute, db-values)}`` for the fields
+       that are benchmarked.
+    """
+    from testapp_dkmodelfields.models import M, Y, D, S, SI
+    return {
+        'MonthField': (M, 'month', [
+            datetime.date(2000 + i % 25, 1 + i % 12, 1) for i in range(N)
+        ]),
+        'YearField': (Y, 'yr', [1990 + i % 50 for i in range(N)]),
+        'DurationField': (D, 'duration', [900 * (i % 40) for i in range(N)]),
+        'StatusField': (S, 'status', [
+            ('first', 'second', 'third')[i % 3] for i in range(N)
+        ]),
+        'StatusField[int]': (SI, 'status', [(1, 3, 2)[i % 3] for i in range(N)]),
+    }
+
+
+def status_table(n):
+    """Return a StatusDef definition with ``n`` statuses.
+    """
+    rule = '=' * 12 + ' ' + '=' * 40 + ' ' + '=' * 20
+    rows = ['@start-big', rule, 'status       verbose' + ' ' * 34 + 'category', rule]
+    rows += [f's{i:<11} Status number {i:<26} # [c{i % 17}, all]' for i in range(n)]
+    rows += [rule, '@end-big']
+    return '\n'.join(rows)
+
+
+@benchmark('StatusDef.parse[500]')
+def statusdef_parse():
+    from dkmodelfields.statusfield import StatusDef
+    txt = status_table(500)
+    return (lambda: StatusDef(txt)), 1
+
+
+@benchmark('postnr.validate_addresses')
+def postnr_validate_addresses():
+    from dkmodelfields import postnr
+    postnr.load_register(os.path.join(DIRNAME, 'data', 'postnummerregister.txt'))
+    rows = [(('0150', '5003', '9900', '1234')[i % 4], ('OSLO', 'Bergen', '', 'X')[i % 4])
+            for i in range(N)]
+    return (lambda: postnr.validate_addresses(rows)), N
+
+
+def timedelta_strings():
+    """Return ``N`` strings in the str(timedelta) format.
+    """
+    return [str(datetime.timedelta(days=i % 3, seconds=37 * i, microseconds=i % 2))
+            for i in range(N)]
+
+
+@benchmark('utils.xstr_to_timedelta')
+def xstr_to_timedelta():
+    from dkmodelfields.utils import xstr_to_timedelta as parse
+    values = timedelta_strings()
+    return (lambda: [parse(v) for v in values]), N
+
+
+@benchmark('utils.xstr_to_timedelta[user-input]')
+def xstr_to_timedelta_user_input():
+    from dkmodelfields.utils import xstr_to_timedelta as parse
+    values = [f'{i % 5}w {i % 7}d {i % 24}:{i % 60:02}' for i in range(N)]
+    return (lambda: [parse(v) for v in values]), N
+
+
+@benchmark('utils.parse_many')
+def parse_many():
+    from dkmodelfields.utils import parse_many as parse
+    values = timedelta_strings()
+    return (lambda: list(parse(values))), N
+
+
+def register_duration_benchmarks(rows=ROWS):
+    """Saving ``n`` duration values (for each ``n`` in ``rows``), without
+       the database round trip.
+    """
+    from django.db import connection
+    from testapp_dkmodelfields.models import D, L
+    field = D._meta.get_field('duration')
+
+    def seconds(n):
+        return [900 * (i % 40) for i in range(n)]
+
+    def register(n):
+        @benchmark(f'DurationField.get_db_prep_save[int,{n}]')
+        def prep_int():
+            values = seconds(n)
+            return (lambda: [field.get_db_prep_save(v, connection) for v in values]), n
+
+        @benchmark(f'DurationField.get_db_prep_save[timedelta,{n}]')
+        def prep_timedelta():
+            values = [datetime.timedelta(seconds=v) for v in seconds(n)]
+            return (lambda: [field.get_db_prep_save(v, connection) for v in values]), n
+
+        @benchmark(f'DurationField.init+pre_save[lazy,{n}]')
+        def pre_save_lazy():
+            # what bulk_create does per value (with new instances every
+            # round, since reading a lazy value converts it)
+            lazy = L._meta.get_field('duration')
+            values = seconds(n)
+            return (lambda: [lazy.get_db_prep_save(lazy.pre_save(L(duration=v), True), connection)
+                             for v in values]), n
+
+    for n in rows:
+        register(n)
+
+
+def register_field_benchmarks():
+    """Register the per-field conversion benchmarks.
+    """
+    from django.db import connection
+
+    def register(name, model, attr, dbvalues):
+        field = model._meta.get_field(attr)
+        pyvalues = [field.to_python(v) for v in dbvalues]
+
+        @benchmark(f'{name}.to_python')
+        def to_python():
+            return (lambda: [field.to_python(v) for v in dbvalues]), N
+
+        @benchmark(f'{name}.get_prep_value')
+        def get_prep_value():
+            return (lambda: [field.get_prep_value(v) for v in pyvalues]), N
+
+        @benchmark(f'{name}.get_db_prep_value')
+        def get_db_prep_value():
+            return (lambda: [field.get_db_prep_value(v, connection)
+                             for v in pyvalues]), N
+
+        @benchmark(f'{name}.from_db_value')
+        def from_db_value():
+            return (lambda: [field.from_db_value(v, None, connection)
+                             for v in dbvalues]), N
+
+        @benchmark(f'{name}.value_to_string')
+        def value_to_string():
+            objs = [model(**{attr: v}) for v in pyvalues]
+            return (lambda: [field.value_to_string(obj) for obj in objs]), N
+
+    for name, (model, attr, dbvalues) in field_cases().items():
+        register(name, model, attr, dbvalues)
+
+
+def roundtrip(model, attr, dbvalues, rows):
+    """Save ``rows`` instances of ``model`` and load them back again.
+       Returns the (save, load) times in seconds.
+    """
+    field = model._meta.get_field(attr)
+    values = [field.to_python(dbvalues[i % len(dbvalues)]) for i in range(rows)]
+    model.objects.all().delete()
+
+    start = time.perf_counter()
+    model.objects.bulk_create(
+        (model(**{attr: v}) for v in values), batch_size=5000
+    )
+    saved = time.perf_counter()
+    loaded = sum(1 for obj in model.objects.all().iterator(chunk_size=5000)
+                 if getattr(obj, attr) is not None)
+    done = time.perf_counter()
+    model.objects.all().delete()
+    assert loaded == rows, (loaded, rows)
+    return saved - start, done - saved
+
+
+def run(pattern='', rows=ROWS, repeat=5):
+    """Run the benchmarks whose name contain ``pattern``.
+    """
+    results = []
+    for name in sorted(BENCHMARKS):
+        if pattern not in name:
+            continue
+        fn, ops = BENCHMARKS[name]()
+        seconds = min(timeit.repeat(fn, number=1, repeat=repeat))
+        results.append(dict(name=name, ops=ops, seconds=seconds,
+                            ops_per_sec=ops / seconds))
+        print(f'{name:45} {ops / seconds:14,.0f} ops/sec', file=sys.stderr)
+
+    for fieldname, (model, attr, dbvalues) in field_cases().items():
+        if pattern not in f'{fieldname}.roundtrip':
+            continue
+        for n in rows:
+            save, load = roundtrip(model, attr, dbvalues, n)
+            for kind, seconds in (('save', save), ('load', load)):
+                name = f'{fieldname}.roundtrip.{kind}[{n}]'
+                results.append(dict(name=name, ops=n, seconds=seconds,
+                                    ops_per_sec=n / seconds))
+                print(f'{name:45} {n / seconds:14,.0f} rows/sec', file=sys.stderr)
+    return results
+
+
+def compare(old, new, threshold=0.1):
+    """Print the relative change in ops/sec between two result lists,
+       flagging slow-downs larger than ``threshold``.
+    """
+    before = {r['name']: r['ops_per_sec'] for r in old}
+    for r in new:
+        if r['name'] not in before:
+            continue
+        change = r['ops_per_sec'] / before[r['name']] - 1
+        flag = '  <-- REGRESSION' if change < -threshold else ''
+        print(f"{r['name']:45} {change:+8.1%}{flag}", file=sys.stderr)
+
+
+def main(argv=None):
+    import django
+    p = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    p.add_argument('-k', dest='pattern', default='',
+                   help='only run benchmarks whose name contains PATTERN')
+    p.add_argument('--rows', default=','.join(str(n) for n in ROWS),
+                   help='comma separated row counts for the round trip and'
+                        ' DurationField save benchmarks')
+    p.add_argument('--repeat', type=int, default=5)
+    p.add_argument('-o', '--output', help='write json results here')
+    p.add_argument('--compare', help='json results from an earlier run')
+    args = p.parse_args(argv)
+
+    setup_django()
+    rows = [int(n) for n in args.rows.split(',') if n]
+    register_field_benchmarks()
+    register_duration_benchmarks(rows)
+    report = dict(
+        python=platform.python_version(),
+        django=django.get_version(),
+        date=datetime.datetime.now().isoformat(),
+        results=run(args.pattern, rows, args.repeat),
+    )
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(json.load(fp)['results'], report['results'])
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from array import array
+
+import pytest
+import ttcal
+from django.db import connection
+
+from dkmodelfields.monthfield import MonthIndex, month_index
+from testapp_dkmodelfields.models import M, MI, Y, D, L
+
+
+def _field(model, name):
+    return model._meta.get_field(name)
+
+
+@pytest.mark.django_db
+def test_export_month():
+    for m in (ttcal.Month(2019, 3), ttcal.Month(2001, 12)):
+        M.objects.create(month=m)
+    col = _field(M, 'month').export_column(M.objects.order_by('month'))
+    assert col == array('i', [month_index(ttcal.Month(2001, 12)),
+                              month_index(ttcal.Month(2019, 3))])
+
+
+@pytest.mark.django_db
+def test_month_index_generic_sql():
+    # the non-sqlite SQL (date extraction) is cast to an integer
+    M.objects.create(month=ttcal.Month(2019, 3))
+    query = M.objects.all().query
+    compiler = query.get_compiler('default')
+    expr = MonthIndex('month').resolve_expression(query)
+    sql, params = expr.as_sql(compiler, connection)
+    assert sql.startswith('CAST(')
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {sql} FROM {M._meta.db_table}', params)
+        assert cursor.fetchall() == [(month_index(ttcal.Month(2019, 3)),)]
+
+
+@pytest.mark.django_db
+def test_export_month_int_storage_nulls():
+    MI.objects.create(index=ttcal.Month(2020, 1))
+    MI.objects.create(index=None)
+    field = _field(MI, 'index')
+    assert field.export_column(MI.objects.order_by('pk')) == array('i', [24240, 0])
+    assert field.export_column(MI.objects.order_by('pk'), null_value=-1) == array('i', [24240, -1])
+    assert field.export_column(MI.objects.none()) == array('i')
+
+
+@pytest.mark.django_db
+def test_export_year_duration():
+    Y.objects.create(yr=ttcal.Year(1999))
+    D.objects.create(duration=ttcal.Duration(hours=1))
+    D.objects.create(duration=None)
+    assert _field(Y, 'yr').export_column(Y.objects.all()) == array('i', [1999])
+    col = _field(D, 'duration').export_column(D.objects.order_by('pk'), chunk_size=1)
+    assert col == array('q', [3600, 0])
+    assert col.typecode == 'q'
+
+
+@pytest.mark.django_db
+def test_import_roundtrip():
+    field = _field(M, 'month')
+    assert field.import_column(M, array('i', [24000, 24011]), batch_size=1) == 2
+    assert [m.month for m in M.objects.order_by('pk')] == [
+        ttcal.Month(2000, 1), ttcal.Month(2000, 12)
+    ]
+    assert field.export_column(M.objects.order_by('pk')) == array('i', [24000, 24011])
+
+
+@pytest.mark.django_db
+def test_import_nulls_and_fields():
+    field = _field(MI, 'index')
+    field.import_column(MI, [24240, -1, None], null_value=-1, month=ttcal.Month(1999, 1))
+    assert [(o.month, o.index) for o in MI.objects.order_by('pk')] == [
+        (ttcal.Month(1999, 1), ttcal.Month(2020, 1)),
+        (ttcal.Month(1999, 1), None),
+        (ttcal.Month(1999, 1), None),
+    ]
+
+
+@pytest.mark.django_db
+def test_default_roundtrip_keeps_nulls():
+    MI.objects.create(month=ttcal.Month(1999, 1), index=ttcal.Month(2020, 1))
+    MI.objects.create(month=ttcal.Month(1999, 1), index=None)
+    field = _field(MI, 'index')
+    col = field.export_column(MI.objects.order_by('pk'))
+    MI.objects.all().delete()
+    field.import_column(MI, col, month=ttcal.Month(1999, 1))
+    assert [o.index for o in MI.objects.order_by('pk')] == [ttcal.Month(2020, 1), None]
+
+    D.objects.create(duration=ttcal.Duration())
+    D.objects.create(duration=None)
+    field = _field(D, 'duration')
+    col = field.export_column(D.objects.order_by('pk'), null_value=-1)
+    D.objects.all().delete()
+    field.import_column(D, col, null_value=-1)
+    assert [o.duration for o in D.objects.order_by('pk')] == [ttcal.Duration(), None]
+
+
+@pytest.mark.django_db
+def test_import_lazy():
+    _field(L, 'duration').import_column(L, [90], month=ttcal.Month(2000, 1))
+    assert L.objects.get().duration == ttcal.Duration(seconds=90)
+
+
+@pytest.mark.django_db
+def test_export_numpy():
+    np = pytest.importorskip('numpy')
+    D.objects.create(duration=ttcal.Duration(seconds=5))
+    col = _field(D, 'duration').export_column(D.objects.all(), numpy=True)
+    assert isinstance(col, np.ndarray)
+    assert col.tolist() == [5]
@@ -9,10 +9,14 @@ import dkmodelfields.adminforms.durationfield
 import dkmodelfields.adminforms.monthfield
 import dkmodelfields.adminforms.yearfield
 import dkmodelfields.apps
+import dkmodelfields.columns
 import dkmodelfields.durationfield
+import dkmodelfields.instrumentation
+import dkmodelfields.jsonl
 import dkmodelfields.monthfield
 import dkmodelfields.norway
 import dkmodelfields.phonefield
+import dkmodelfields.postnr
 import dkmodelfields.statusfield
 import dkmodelfields.subclassing
 import dkmodelfields.utils
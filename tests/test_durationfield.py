@@ -108,3 +108,105 @@ def test_formfield():
 def test_value_to_string():
     df = DurationField()
     assert df.value_to_string(None) == ''
+
+
+def test_duration_cache():
+    df = DurationField()
+    assert df.cache_info() is None
+    assert df.to_python(900) is not df.to_python(900)
+
+    df = DurationField(cache_size=2)
+    assert df.to_python(900) is df.to_python(900)
+    assert df.to_python(1800) == Duration(minutes=30)
+    assert df.to_python(3600) == Duration(hours=1)
+    info = df.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 3, 2, 2)
+    df.cache_clear()
+    assert df.cache_info().currsize == 0
+
+    name, path, args, kwargs = df.deconstruct()
+    assert 'cache_size' not in kwargs           # a runtime setting
+
+
+def test_get_db_prep_value_fast_paths():
+    df = DurationField()
+    assert df.get_db_prep_value(3600, connection) == 3600
+    assert df.get_db_prep_value(timedelta(days=2, seconds=5, microseconds=9), connection) == 2 * 86400 + 5
+    assert df.get_prep_value(timedelta(hours=1)) == 3600
+    assert df.get_prep_value(Duration(days=-1, hours=1)) == -86400 + 3600
+    assert df.get_prep_value('1:00:00') == 3600
+
+
+@pytest.mark.django_db
+def test_lazy_bulk_create_unconverted():
+    from testapp_dkmodelfields.models import L
+    field = L._meta.get_field('duration')
+    objs = [L(month=ttcal.Month(2020, 1), duration=v) for v in (60, 120)]
+    assert field.pre_save(objs[0], True) == 60
+    assert '_duration_unconverted' in objs[0].__dict__
+    L.objects.bulk_create(objs)
+    assert [o.duration for o in L.objects.order_by('pk')] == [
+        Duration(minutes=1), Duration(minutes=2)
+    ]
+
+
+def test_precision():
+    ms = DurationField(precision='ms')
+    us = DurationField(precision='us')
+    td = timedelta(seconds=2, microseconds=345678)
+    assert ms.get_prep_value(td) == 2345
+    assert us.get_prep_value(td) == 2345678
+    assert ms.get_db_prep_value(2345, connection) == 2345
+    assert ms.to_python(2345) == timedelta(seconds=2, microseconds=345000)
+    assert us.to_python(-1) == timedelta(microseconds=-1)
+    assert isinstance(us.to_python(2345678), Duration)
+    assert us.to_python(td) == td
+    assert isinstance(us.to_python(td), Duration)
+    assert ms.to_python(2345.6) == timedelta(seconds=2, microseconds=346000)
+    assert ms.to_python('0:00:02.345000') == timedelta(seconds=2, microseconds=345000)
+    assert ms.to_python('2345') == timedelta(seconds=2, microseconds=345000)
+    assert DurationField().to_python(2.6) == Duration(seconds=3)
+
+    name, path, args, kwargs = ms.deconstruct()
+    assert kwargs == {'precision': 'ms'}
+    with pytest.raises(ValueError):
+        DurationField(precision='ns')
+
+
+@pytest.mark.django_db
+def test_precision_db():
+    from django.db.models import Avg, Sum
+    from testapp_dkmodelfields.models import D
+    D.objects.create(latency=timedelta(milliseconds=1500))
+    D.objects.create(latency=timedelta(milliseconds=2))
+    D.objects.create(latency=timedelta(milliseconds=3, microseconds=900))
+    obj = D.objects.order_by('pk').first()
+    assert obj.latency == timedelta(milliseconds=1500)
+    assert D.objects.filter(latency__gt=timedelta(seconds=1)).count() == 1
+    assert D.objects.filter(latency__lt=5).count() == 2
+    res = D.objects.aggregate(total=Sum('latency'), avg=Avg('latency'))
+    assert res['total'] == timedelta(milliseconds=1505)
+    assert isinstance(res['total'], Duration)
+    assert res['avg'] == timedelta(milliseconds=502)      # 501.67 rounded
+    assert isinstance(res['avg'], Duration)
+    assert D._meta.get_field('latency').value_to_string(obj) == '1500'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fmt', ['json', 'python', 'dkjsonl'])
+def test_precision_negative_roundtrip(fmt):
+    from django.core import serializers
+    from testapp_dkmodelfields.models import D
+    serializers.register_serializer('dkjsonl', 'dkmodelfields.jsonl')
+    field = D._meta.get_field('latency')
+    neg = timedelta(milliseconds=-5)
+    D.objects.create(duration=ttcal.Duration(seconds=-5), latency=neg)
+    obj = D.objects.get()
+    assert field.value_to_string(obj) == '-5'
+    assert field.to_python('-5') == neg
+    assert field.to_python(str(neg)) == neg      # '-1 day, 23:59:59.995000'
+    assert field.to_python('-0:00:00.005000') == neg
+    data = serializers.serialize(fmt, [obj])
+    res = next(serializers.deserialize(fmt, data)).object
+    assert res.latency == neg
+    assert res.duration == ttcal.Duration(seconds=-5)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import pytest
+import ttcal
+
+from dkmodelfields import instrumentation, MonthField, DurationField
+from dkmodelfields.monthfield import clear_month_cache
+from testapp_dkmodelfields.models import M
+
+
+@pytest.fixture
+def instr():
+    instrumentation.reset()
+    with instrumentation.instrumented():
+        yield instrumentation
+    instrumentation.reset()
+
+
+def test_disabled_is_unpatched():
+    assert not instrumentation.is_enabled()
+    original = MonthField.__dict__['to_python']
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        assert MonthField.__dict__['to_python'] is not original
+    assert MonthField.__dict__['to_python'] is original
+    assert 'to_python' not in instrumentation.field_classes()[-1].__dict__
+
+
+@pytest.mark.django_db
+def test_counts(instr):
+    clear_month_cache()
+    for i in range(3):
+        M.objects.create(month=ttcal.Month(2020, 1 + i % 2))
+    instr.reset()
+    assert len(list(M.objects.all())) == 3
+    st = instr.stats()[('testapp_dkmodelfields.M', 'month')]
+    assert st['from_db_value']['calls'] == 3
+    assert st['from_db_value']['errors'] == 0
+    assert st['from_db_value']['seconds'] > 0
+    assert st['to_python']['calls'] == 3          # the model's descriptor
+    caches = instr.cache_stats()
+    assert caches['month']['hits'] + caches['month']['misses'] == 2
+
+
+def test_errors(instr):
+    field = MonthField()
+    with pytest.raises(Exception):
+        field.to_python(object())
+    assert instr.stats()[(None, None)]['to_python'] == dict(
+        calls=1, seconds=pytest.approx(0, abs=1), errors=1
+    )
+
+
+def test_duration_cache_stats(instr):
+    field = DurationField(cache_size=10)
+    field.name = 'dur'
+    field.cache_clear()
+    field.to_python(60)
+    field.to_python(60)
+    assert instr.cache_stats()[(None, 'dur')] == dict(hits=1, misses=1, hit_rate=0.5)
+
+
+def test_flush_signal(instr):
+    received = []
+
+    def receiver(sender, stats, caches, **kwargs):
+        received.append((stats, caches))
+
+    instrumentation.stats_flushed.connect(receiver)
+    try:
+        DurationField().get_prep_value(60)
+        res = instr.flush()
+    finally:
+        instrumentation.stats_flushed.disconnect(receiver)
+    assert res[(None, None)]['get_prep_value']['calls'] == 1
+    assert received == [(res, {})]
+    assert instr.stats() == {}
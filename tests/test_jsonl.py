@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+from datetime import timedelta
+
+import pytest
+import ttcal
+from django.core import serializers
+from django.core.management import call_command
+
+from dkmodelfields import jsonl
+from testapp_dkmodelfields.models import M, MI, Y, D, L
+
+serializers.register_serializer('dkjsonl', 'dkmodelfields.jsonl')
+
+
+def _lines(txt):
+    return [json.loads(line) for line in txt.splitlines()]
+
+
+@pytest.mark.django_db
+def test_serialize_encodings():
+    M.objects.create(month=ttcal.Month(2019, 3))
+    Y.objects.create(yr=ttcal.Year(2021))
+    D.objects.create(duration=ttcal.Duration(hours=2, seconds=5))
+    D.objects.create(duration=ttcal.Duration())
+    D.objects.create(duration=None)
+    MI.objects.create(month=None, index=ttcal.Month(2020, 12))
+    objs = list(M.objects.all()) + list(Y.objects.all()) + list(D.objects.all()) + list(MI.objects.all())
+    rows = _lines(serializers.serialize('dkjsonl', objs))
+    assert [r['fields'] for r in rows] == [
+        {'month': '2019-03'},
+        {'yr': 2021},
+        {'duration': 7205, 'latency': None},
+        {'duration': 0, 'latency': None},
+        {'duration': None, 'latency': None},
+        {'month': None, 'index': '2020-12'},
+    ]
+
+
+@pytest.mark.django_db
+def test_serialize_lazy_unconverted():
+    L.objects.create(month=ttcal.Month(2018, 1), duration=ttcal.Duration(seconds=90))
+    obj = L.objects.get()
+    rows = _lines(serializers.serialize('dkjsonl', [obj]))
+    assert rows[0]['fields'] == {'month': '2018-01', 'duration': 90}
+    assert '_month_unconverted' in obj.__dict__      # not converted
+
+
+@pytest.mark.django_db
+def test_roundtrip():
+    M.objects.create(month=ttcal.Month(2019, 3))
+    D.objects.create(duration=ttcal.Duration(days=1, seconds=1),
+                     latency=timedelta(seconds=1, milliseconds=5))
+    txt = serializers.serialize('dkjsonl', list(M.objects.all()) + list(D.objects.all()))
+    objs = [o.object for o in serializers.deserialize('dkjsonl', io.StringIO(txt))]
+    assert objs[0].month == ttcal.Month(2019, 3)
+    assert objs[1].duration == ttcal.Duration(days=1, seconds=1)
+    assert objs[1].latency == timedelta(seconds=1, milliseconds=5)
+    assert _lines(txt)[1]['fields']['latency'] == 1005
+
+
+@pytest.mark.django_db
+def test_load_bulk_create(django_assert_num_queries):
+    txt = '\n'.join(
+        json.dumps({'model': 'testapp_dkmodelfields.d', 'pk': i + 1,
+                    'fields': {'duration': i * 60}})
+        for i in range(25)
+    ) + '\n' + json.dumps({'model': 'testapp_dkmodelfields.m', 'pk': 1,
+                           'fields': {'month': '2001-02'}}) + '\n\n'
+    with django_assert_num_queries(4):
+        assert jsonl.load(txt, batch_size=10) == 26
+    assert D.objects.count() == 25
+    assert D.objects.get(pk=25).duration == ttcal.Duration(minutes=24)
+    assert M.objects.get().month == ttcal.Month(2001, 2)
+
+
+@pytest.mark.django_db
+def test_loaddata(tmp_path):
+    Y.objects.create(yr=ttcal.Year(1999))
+    fname = tmp_path / 'years.dkjsonl'
+    call_command('dumpdata', 'testapp_dkmodelfields.y', format='dkjsonl', output=str(fname))
+    Y.objects.all().delete()
+    call_command('loaddata', str(fname), verbosity=0)
+    assert Y.objects.get().yr == ttcal.Year(1999)
+
+
+def test_deserialize_error():
+    with pytest.raises(serializers.base.DeserializationError):
+        list(serializers.deserialize('dkjsonl', '{"model": "testapp_dkmodelfields.m", "fields": {'))
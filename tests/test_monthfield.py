@@ -3,16 +3,19 @@ import datetime
 import django
 import pytest
 from datetime import date, timedelta
+from types import SimpleNamespace
 
 from django.core.exceptions import ValidationError
 from django.db import connection
+from django.db.models import Q
 from django.forms import Form
 from django.test import RequestFactory
 import ttcal
 from dkmodelfields import MonthField
 from dkmodelfields import adminforms
-from dkmodelfields.monthfield import MonthFieldYearSimpleFilter
-from testapp_dkmodelfields.models import M, AM
+from dkmodelfields.monthfield import MonthFieldYearSimpleFilter, get_month, clear_month_cache
+from dkmodelfields.monthfield import month_index, month_from_index, month_storage_migration
+from testapp_dkmodelfields.models import M, AM, MI
 from .page import Page
 
 
@@ -187,6 +190,31 @@ def test_to_python():
         mf.to_python(5)
 
 
+def test_get_month():
+    clear_month_cache()
+    assert get_month(2017, 1) == ttcal.Month(2017, 1)
+    assert get_month(2017, 1) is get_month(2017, 1)
+    assert get_month(2017, 1) is not get_month(2017, 2)
+
+
+def test_from_db_value():
+    mf = MonthField()
+    assert mf.from_db_value(None, None, connection) is None
+    assert mf.from_db_value('2017-03-01', None, connection) == ttcal.Month(2017, 3)
+    assert mf.from_db_value(date(2017, 3, 1), None, connection) is get_month(2017, 3)
+
+
+def test_db_converters(db):
+    M.objects.all().delete()
+    M.objects.bulk_create([M(month=ttcal.Month(2017, 1 + i % 3)) for i in range(9)])
+    mf = M._meta.get_field('month')
+    convert, = mf.get_db_converters(connection)
+    assert convert('2017-01-01', None, connection) is convert('2017-01-01', None, connection)
+    months = [m.month for m in M.objects.order_by('id')]
+    assert months == [ttcal.Month(2017, 1 + i % 3) for i in range(9)]
+    assert len({id(m) for m in months}) == 3
+
+
 def test_get_db_prep_save():
     mf = MonthField()
     assert mf.get_db_prep_save('2016-04', None) == '2016-04'
@@ -242,3 +270,165 @@ def test_subfieldbase(db):
     # pprint.pprint(page.viewstate())
     assert page.viewstate()['jan'] == jan
 
+
+
+def test_month_index():
+    assert month_index(ttcal.Month(2022, 1)) == 2022 * 12
+    assert month_index(date(2022, 12, 24)) == 2022 * 12 + 11
+    assert month_from_index(2022 * 12 + 11) is get_month(2022, 12)
+
+
+def test_int_storage():
+    mf = MonthField(storage='int')
+    assert mf.db_type(connection) == 'INTEGER'
+    assert mf.deconstruct()[3] == {'storage': 'int'}
+    ix = 2016 * 12 + 3
+    assert mf.get_prep_value(ttcal.Month(2016, 4)) == ix
+    assert mf.get_prep_value('2016-04') == ix
+    assert mf.get_prep_value('2016-04-01') == ix
+    assert mf.get_prep_value(date(2016, 4, 2)) == ix
+    assert mf.get_prep_value(ix) == ix
+    assert mf.get_prep_value(None) is None
+    assert mf.get_db_prep_save(ttcal.Month(2016, 4), connection) == ix
+    assert mf.to_python(ix) == ttcal.Month(2016, 4)
+    assert mf.from_db_value(ix, None, connection) is get_month(2016, 4)
+
+    with pytest.raises(ValueError):
+        MonthField(storage='varchar')
+
+
+def test_int_storage_model(db):
+    MI.objects.all().delete()
+    for m in range(1, 13):
+        MI.objects.create(index=ttcal.Month(2021, m))
+    obj = MI.objects.get(index=ttcal.Month(2021, 3))
+    assert obj.index == ttcal.Month(2021, 3)
+    assert MI.objects.filter(index__gte=ttcal.Month(2021, 10)).count() == 3
+    assert MI.objects.filter(
+        index__range=(ttcal.Month(2021, 2), ttcal.Month(2021, 4))
+    ).count() == 3
+    assert MI.objects.values_list('index', flat=True).order_by('index').first() == ttcal.Month(2021, 1)
+
+
+def test_month_storage_migration(db):
+    from django.apps import apps
+    MI.objects.all().delete()
+    MI.objects.create(month=ttcal.Month(2019, 12))
+    MI.objects.create(month=ttcal.Month(2020, 1))
+    MI.objects.create(month=None)
+
+    op = month_storage_migration('testapp_dkmodelfields', 'mi', 'month', 'index')
+    # (the sqlite schema editor can't be used inside the test transaction)
+    schema_editor = SimpleNamespace(connection=connection)
+    op.code(apps, schema_editor)
+    assert [(r.month, r.index) for r in MI.objects.order_by('id')] == [
+        (ttcal.Month(2019, 12), ttcal.Month(2019, 12)),
+        (ttcal.Month(2020, 1), ttcal.Month(2020, 1)),
+        (None, None),
+    ]
+
+    MI.objects.update(month=None)
+    op.reverse_code(apps, schema_editor)
+    assert [r.month for r in MI.objects.order_by('id')] == [
+        ttcal.Month(2019, 12), ttcal.Month(2020, 1), None
+    ]
+
+
+@pytest.mark.parametrize('model, field', [(M, 'month'), (MI, 'index')])
+def test_year_lookups(db, model, field):
+    model.objects.all().delete()
+    for y in (2021, 2022, 2023):
+        for m in (1, 6, 12):
+            model.objects.create(**{field: ttcal.Month(y, m)})
+
+    def count(lookup, value):
+        qs = model.objects.filter(**{f'{field}__year__{lookup}': value})
+        sql = str(qs.query)
+        assert 'django_date_extract' not in sql and '%' not in sql, sql
+        return qs.count()
+
+    assert count('exact', 2022) == 3
+    assert count('exact', ttcal.Year(2022)) == 3
+    assert count('gt', 2021) == 6
+    assert count('gte', 2022) == 6
+    assert count('lt', 2022) == 3
+    assert count('lte', 2022) == 6
+    assert count('exact', 2020) == 0
+
+    years = model.objects.order_by(f'{field}__year').values_list(f'{field}__year', flat=True).distinct()
+    assert [int(y) for y in years] == [2021, 2022, 2023]
+
+
+@pytest.mark.parametrize('model, field', [(M, 'month'), (MI, 'index')])
+def test_month_range_lookups(db, model, field):
+    model.objects.all().delete()
+    for m in range(1, 13):
+        model.objects.create(**{field: ttcal.Month(2021, m)})
+        model.objects.create(**{field: ttcal.Month(2022, m)})
+
+    def months(lookup, value):
+        qs = model.objects.filter(**{f'{field}__{lookup}': value}).order_by(field)
+        return [(getattr(r, field).year, getattr(r, field).month) for r in qs]
+
+    assert months('quarter', (2022, 2)) == [(2022, 4), (2022, 5), (2022, 6)]
+    assert months('quarter', ttcal.Quarter(2021, 4)) == [(2021, 10), (2021, 11), (2021, 12)]
+    assert months('half', (2021, 2)) == [(2021, m) for m in range(7, 13)]
+    assert months('fiscal_year', 2021) == [(2021, m) for m in range(1, 13)]
+    assert months('fiscal_quarter', (2022, 1)) == [(2022, 1), (2022, 2), (2022, 3)]
+    assert months('between', ('2021-11', ttcal.Month(2022, 2))) == [
+        (2021, 11), (2021, 12), (2022, 1), (2022, 2)
+    ]
+    q1, q4 = Q(**{f'{field}__quarter': (2022, 1)}), Q(**{f'{field}__quarter': (2021, 4)})
+    assert model.objects.filter(q1 | q4).count() == 6
+    assert model.objects.exclude(q1 | q4).count() == 18
+    sql = str(model.objects.filter(q1).query)
+    assert 'WHERE (' in sql                          # parenthesized predicate
+
+    mf = model._meta.get_field(field)
+    mf.fiscal_year_start = 7
+    try:
+        assert months('fiscal_year', 2021) == [(2021, m) for m in range(7, 13)] + [(2022, m) for m in range(1, 7)]
+        assert months('fiscal_quarter', (2021, 3)) == [(2022, 1), (2022, 2), (2022, 3)]
+    finally:
+        mf.fiscal_year_start = 1
+
+    with pytest.raises(ValueError):
+        months('quarter', (2022, 5))
+
+
+def test_fiscal_year_start():
+    assert MonthField(fiscal_year_start=7).deconstruct()[3] == {'fiscal_year_start': 7}
+    with pytest.raises(ValueError):
+        MonthField(fiscal_year_start=13)
+
+
+def test_month_field_year_simple_filter_field_name(db):
+    MI.objects.all().delete()
+    MonthFieldYearSimpleFilter.clear_cache()
+
+    class IndexYearFilter(MonthFieldYearSimpleFilter):
+        field_name = 'index'
+
+    MI.objects.create(index=ttcal.Month(2019, 5))
+    MI.objects.create(index=ttcal.Month(2021, 1))
+    MI.objects.create(index=ttcal.Month(2021, 2))
+    MI.objects.create(index=None)
+    rf = RequestFactory()
+    f = IndexYearFilter(request=rf.get('/'), params={}, model=MI, model_admin=AM(MI, None))
+    assert f.lookups(rf.get('/'), AM(MI, None)) == [('2019', 2019), ('2021', 2021)]
+
+    # the year list is cached..
+    MI.objects.create(index=ttcal.Month(2022, 1))
+    assert f.years(MI.objects.all()) == [2019, 2021]
+    MonthFieldYearSimpleFilter.clear_cache()
+    assert f.years(MI.objects.all()) == [2019, 2021, 2022]
+    assert f.years(MI.objects.none()) == []
+
+    f = IndexYearFilter(request=rf.get('/'), params={'month_year': '2021'},
+                        model=MI, model_admin=AM(MI, None))
+    assert f.queryset(None, MI.objects.all()).count() == 2
+
+    # the default is the model's first MonthField
+    assert MonthFieldYearSimpleFilter(
+        request=rf.get('/'), params={}, model=MI, model_admin=AM(MI, None)
+    ).get_field_name(MI) == 'month'
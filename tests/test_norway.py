@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
+import os
+from types import SimpleNamespace
+
 import pytest
 from django.core.exceptions import ValidationError
 
 from dkmodelfields import TelefonField, GateField, PostnrField, PoststedField
 from django.utils.translation import gettext_lazy as _
+from dkmodelfields import postnr
+from dkmodelfields.postnr import PostnrRegister
 
 
 # TELEFON FIELD ####
@@ -95,3 +100,97 @@ def test_poststed_validate():
     pf = PoststedField()
     assert pf.run_validators("Kirkenes") is None
     assert pf.run_validators("") is None
+
+
+# POSTAL CODE REGISTER ####
+
+REGISTER = os.path.join(os.path.dirname(__file__), 'data', 'postnummerregister.txt')
+
+
+@pytest.fixture
+def register():
+    yield postnr.load_register(REGISTER)
+    postnr.set_register(None)
+
+
+def test_register_from_file(register):
+    assert len(register) == 7
+    assert register.poststed('0150') == 'OSLO'
+    assert register.poststed('9008') == 'TROMSØ'     # cp1252 file
+    assert register.poststed('1234') is None
+    assert register.poststed('12') is None
+    assert '9900' in register
+    assert 'abcd' not in register
+
+
+def test_register_shares_names():
+    r = PostnrRegister([('0001', 'OSLO'), ('0150', 'OSLO'), ('5003', 'BERGEN')])
+    assert r._names == (None, 'OSLO', 'BERGEN')
+
+
+def test_register_from_settings(settings):
+    postnr.set_register(None)
+    settings.DKMODELFIELDS_POSTNR_REGISTER = REGISTER
+    try:
+        assert postnr.poststed_for('5003') == 'BERGEN'
+    finally:
+        postnr.set_register(None)
+
+
+def test_no_register():
+    assert postnr.get_register() is None
+    assert postnr.poststed_for('5003') is None
+    assert postnr.check_postnr('1234') is None
+    assert postnr.check_postnr('12a4') is not None
+
+
+def test_postnr_validate_register(register):
+    pf = PostnrField()
+    assert pf.run_validators("9900") is None
+    with pytest.raises(ValidationError):
+        pf.run_validators("1234")
+    with pytest.raises(ValidationError):
+        pf.run_validators("12a4")
+
+
+def test_poststed_consistency(register):
+    pf = PoststedField(postnr_field='postnr')
+    pf.set_attributes_from_name('poststed')
+    obj = SimpleNamespace(postnr='9900', poststed='')
+    pf.validate('Kirkenes', obj)
+    pf.validate('KIRKENES', obj)
+    with pytest.raises(ValidationError):
+        pf.validate('Oslo', obj)
+    PoststedField().validate('Oslo', obj)
+
+
+def test_poststed_autofill(register):
+    pf = PoststedField(postnr_field='postnr')
+    pf.set_attributes_from_name('poststed')
+    obj = SimpleNamespace(postnr='7054', poststed='')
+    assert pf.pre_save(obj, True) == 'RANHEIM'
+    assert obj.poststed == 'RANHEIM'
+    obj = SimpleNamespace(postnr='7054', poststed='Trondheim')
+    assert pf.pre_save(obj, True) == 'Trondheim'
+
+
+def test_validate_addresses(register):
+    rows = [('0150', 'Oslo'), ('0150', 'Bergen'), ('1234', ''), ('12', None),
+            ('5003', None), (None, 'Oslo'), (150, 'Oslo'), ('0150', 42)]
+    errors = postnr.validate_addresses(rows)
+    assert [i for i, _msg in errors] == [1, 2, 3, 5, 6, 7]
+    assert errors[0][1] == postnr.check_poststed('0150', 'Bergen')
+    assert errors[3][1] == postnr.check_postnr(None)
+
+
+def test_validate_addresses_no_register():
+    assert postnr.validate_addresses([('1234', 'X'), ('12', 'Y')]) == [
+        (1, "Postnummer må være 4 siffer"),
+    ]
+
+
+def test_validate_telefon_many():
+    errors = postnr.validate_telefon_many(['93420252', '9342025', '9342025x', None, 93420252])
+    assert [i for i, _msg in errors] == [1, 2, 3, 4]
+    with pytest.raises(ValidationError):
+        TelefonField().run_validators('9342025x')
@@ -2,7 +2,7 @@
 import pytest
 from django.core.exceptions import ValidationError
 
-from dkmodelfields.phonefield import TelephoneField
+from dkmodelfields.phonefield import TelephoneField, normalize_e164, normalize_many
 from django.utils.translation import gettext_lazy as _
 
 
@@ -26,3 +26,37 @@ def test_validate():
 
     with pytest.raises(ValidationError):
         assert not pf.run_validators("93420252")
+
+
+def test_normalize_e164():
+    assert normalize_e164('+47.22334455') == '+47.22334455'
+    assert normalize_e164('+47 22 33 44 55') == '+47.22334455'
+    assert normalize_e164('+4722334455') == '+47.22334455'
+    assert normalize_e164('0047-22 33 44 55') == '+47.22334455'
+    assert normalize_e164('+47.22 33 44 55') == '+47.22334455'
+    assert normalize_e164('+1 (212) 555-1234') == '+1.2125551234'
+    assert normalize_e164('+358401234567') == '+358.401234567'
+    assert normalize_e164('+47 22334455 ext. 12') == '+47.22334455x12'
+    for value in ('22334455', '+47', '+47 22 33 44 55 66 77 88 99', 'tel'):
+        with pytest.raises(ValidationError):
+            normalize_e164(value)
+
+
+def test_normalize_many():
+    normalized, errors = normalize_many(['+47 22 33 44 55', '', None, '1234'])
+    assert normalized == ['+47.22334455', None, None, None]
+    assert [(i, v) for i, v, msg in errors] == [(3, '1234')]
+    normalized, errors = normalize_many([4722334455, 0, '+4722334455'])
+    assert normalized == [None, None, '+47.22334455']
+    assert [(i, v) for i, v, msg in errors] == [(0, 4722334455)]
+
+
+def test_to_python():
+    pf = TelephoneField()
+    assert pf.to_python('+47 93 42 02 52') == '+47.93420252'
+    assert pf.to_python('93420252') == '93420252'
+    assert pf.to_python(None) is None
+    assert pf.get_prep_value('0047 93420252') == '+47.93420252'
+    assert pf.clean('+47 93 42 02 52', None) == '+47.93420252'
+    with pytest.raises(ValidationError):
+        pf.clean('93420252', None)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+import ttcal
+from django.core.management import call_command, CommandError
+
+from testapp_dkmodelfields.models import M, D
+
+
+def profile(*args, **kwargs):
+    out = io.StringIO()
+    call_command('dkmodelfields_profile', *args, stdout=out, **kwargs)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_profile():
+    for i in range(10):
+        D.objects.create(duration=ttcal.Duration(seconds=60 * (i % 3)),
+                         latency=ttcal.Duration(seconds=i))
+    lines = profile('testapp_dkmodelfields.D', chunk_size=4).splitlines()
+    assert lines[0].startswith('testapp_dkmodelfields.D: 10 rows')
+    columns = {line.split()[0]: line.split() for line in lines[2:]}
+    assert columns['duration'][1] == 'DurationField'
+    assert columns['duration'][-1] == '3'         # distinct values
+    assert columns['latency'][-1] == '10'
+
+    lines = profile('testapp_dkmodelfields.D', chunk_size=4, max_distinct=5).splitlines()
+    columns = {line.split()[0]: line.split() for line in lines[2:]}
+    assert columns['duration'][-1] == '3'
+    assert columns['latency'][-1] == '>5'
+
+
+@pytest.mark.django_db
+def test_profile_limit_and_empty():
+    M.objects.create(month=ttcal.Month(2020, 1))
+    M.objects.create(month=ttcal.Month(2020, 2))
+    assert 'M: 1 rows' in profile('testapp_dkmodelfields.M', limit=1)
+    M.objects.all().delete()
+    out = profile('testapp_dkmodelfields.M')
+    assert out.startswith('testapp_dkmodelfields.M: 0 rows')
+    assert len(out.splitlines()) == 1
+
+
+def test_profile_errors():
+    with pytest.raises(CommandError):
+        profile('testapp_dkmodelfields.Nonexisting')
+    with pytest.raises(CommandError):
+        profile('contenttypes.ContentType')
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
+import pickle
+
 import pytest
 from django.db import connection
 from django.forms import ChoiceField
 
-from dkmodelfields.statusfield import StatusField, StatusValue
+from dkmodelfields.statusfield import (
+    StatusField, StatusValue, StatusDef, get_statusdef, clear_statusdef_cache
+)
 from django.utils.translation import gettext_lazy as _
 from testapp_dkmodelfields.models import S
 
@@ -36,14 +40,39 @@ def test_status_field():
 
     sd = sf.statusdef
     assert sd.category('sale') == u'done'
-    assert sd.categories('sale') == [u'done']
-    assert sd.categories('foo') == [u'bar', u'baz']
+    assert sd.categories('sale') == (u'done',)
+    assert sd.categories('foo') == (u'bar', u'baz')
     assert sd.valid_status('sale')
 
+    assert sd.in_category('sale', 'done')
+    assert not sd.in_category('sale', 'init')
+    assert sd.in_category(sf.to_python('foo'), 'baz')
+    with pytest.raises(ValueError, match='Unknown status'):
+        sd.in_category('asdf', 'done')
+    with pytest.raises(ValueError, match='Unknown status'):
+        sd.in_category(1, 'done')                   # no codes
+    initerr = sd.mask_for('init', 'err')
+    assert [name for name, _ in sd.options if sd.in_category(name, initerr)] == ['new', 'error']
+    assert sf.to_python('new').mask & initerr
+    assert not sf.to_python('credit').mask & initerr
+    assert sd.mask_for() == 0
+    with pytest.raises(KeyError):
+        sd.mask_for('asdf')
+
     assert set(sf.get_prep_lookup('in', 'done')) == ({'cancelled', 'credit', 'sale'})
     assert set(sf.get_prep_lookup('in', 'new')) == ({'new'})
     assert set(sf.get_prep_lookup('in', ['new', 'err'])) == ({'new', 'error'})
+
+    assert sd.category_names()['done'] == ('sale', 'cancelled', 'credit')
+    assert sd.category_names()['baz'] == ('foo',)
+    assert sd.category_names(primary=True)['bar'] == ('foo',)
+    assert 'baz' not in sd.category_names(primary=True)
     assert set(sf.get_prep_lookup('in', None)) == ({None})
+    assert sf.get_prep_lookup('in', ['err', 'done', 'sale']) == ['error', 'sale', 'cancelled', 'credit']
+    assert sf.get_prep_lookup('in', ('bar',)) == ['foo']
+    with pytest.raises(ValueError):
+        sf.get_prep_lookup('in', ['asdf'])
+    assert sd.expand(['err', 'done']) is sd.expand(['err', 'done'])
     sv = StatusValue(name='cancelled', verbose='Ordren er kansellert', categories=('done', 'ready'))
     assert str(sv) == sv.name
     assert repr(sv).startswith('StatusValue(')
@@ -88,3 +117,192 @@ def test_s_model(db):
     s.status = 'first'
     print("TYPE:", type(s), s)
     assert isinstance(s.status, StatusValue)
+
+
+def test_status_in_lookup(db):
+    S.objects.all().delete()
+    S.objects.create(status='first')
+    S.objects.create(status='second')
+    S.objects.create(status='third')
+    assert S.objects.filter(status__in=['init']).count() == 1
+    assert S.objects.filter(status__in=['init', 'post']).count() == 2
+    assert S.objects.filter(status__in=['second', 'post']).count() == 2
+    assert S.objects.filter(status__in=S.objects.filter(status='first').values('status')).count() == 1
+
+
+def test_status_value():
+    sv = StatusValue(name='sale', verbose='Fakturert', categories='done, ok')
+    assert sv.categories == ('done', 'ok')
+    assert not hasattr(sv, '__dict__')
+    with pytest.raises(AttributeError):
+        sv.name = 'foo'
+    with pytest.raises(AttributeError):
+        del sv.name
+
+    same = StatusValue(name='sale', verbose='Fakturert', categories=('done',))
+    other = StatusValue(name='new', verbose='Ny', categories=('init',))
+    assert sv == same
+    assert sv != other
+    assert sv == 'sale'
+    assert sv != 'new'
+    assert sv != 42
+    assert hash(sv) == hash('sale')
+    assert {sv, same, other} == {'sale', 'new'}
+    assert 'sale' in {sv: 1}
+
+    sv = StatusValue(name='sale', verbose='Fakturert', categories='done', mask=4)
+    copy = pickle.loads(pickle.dumps(sv))
+    assert copy == sv
+    assert copy.mask == 4
+    assert copy.verbose == sv.verbose
+    assert copy.categories == sv.categories
+
+
+def test_statusdef_cache():
+    clear_statusdef_cache()
+    sd = get_statusdef(S.S_STATUSDEF)
+    assert isinstance(sd, StatusDef)
+    assert get_statusdef(S.S_STATUSDEF) is sd
+    assert StatusField(S.S_STATUSDEF).statusdef is sd
+    clear_statusdef_cache()
+    assert get_statusdef(S.S_STATUSDEF) is not sd
+
+
+def test_statusdef_parse():
+    with pytest.warns(UserWarning):
+        sd = StatusDef("""
+            @start-x
+            ==== =========== ==========
+            status  verbose  category
+            ==== =========== ==========
+            a       A        # [x]
+            b-2     B, b     # [x, y]  trailing text
+            Bad     uppercase name
+            ==== =========== ==========
+            @end-x
+        """)
+    assert list(sd.status.keys()) == ['a', 'b-2']
+    assert sd.status['b-2'].verbose == 'B, b'
+    assert sd.categories('b-2') == ('x', 'y')
+    assert sd.errors == [(8, 'Bad     uppercase name')]
+    assert sd.errors[0].lineno == 8
+
+
+def test_statusdef_parse_error_warns():
+    with pytest.warns(UserWarning, match='line 1'):
+        StatusDef("oops")
+
+
+CODED = u"""
+    ==== =========== ======================= ==========
+    code status      verbose                 category
+    ==== =========== ======================= ==========
+    10   new         Ny                      # [init]
+    20   sale        Fakturert               # [done]
+    30   credit      Kreditert               # [done]
+    ==== =========== ======================= ==========
+"""
+
+
+def test_statusdef_codes():
+    sd = StatusDef(CODED)
+    assert not sd.errors
+    assert sd.has_codes
+    assert sd.status['sale'].code == 20
+    assert sd.by_code[30].name == 'credit'
+    assert sd.expand_codes(['done', 'new']) == (20, 30, 10)
+    assert sd.expand([10, 'done']) == ('new', 'sale', 'credit')
+    assert sd.in_category(20, 'done') and not sd.in_category(10, 'done')
+    with pytest.raises(ValueError):
+        sd.in_category(1, 'done')
+    assert pickle.loads(pickle.dumps(sd.status['sale'])).code == 20
+    assert sd.status['sale'].__json__()['code'] == 20
+    assert not get_statusdef(S.S_STATUSDEF).has_codes
+    with pytest.raises(ValueError):
+        StatusDef(CODED.replace('30  ', '20  '))
+
+
+def test_int_storage_field():
+    sf = StatusField(CODED, storage='int')
+    assert sf.db_type(connection) == 'SMALLINT'
+    assert sf.to_python(20) is sf.statusdef.status['sale']
+    assert sf.to_python('sale') is sf.statusdef.status['sale']
+    with pytest.raises(ValueError):
+        sf.to_python(99)
+    assert sf.get_prep_value('credit') == 30
+    assert sf.get_prep_value(sf.statusdef.status['new']) == 10
+    assert sf.get_prep_value(20) == 20
+    assert sf.get_prep_lookup('in', 'done') == [20, 30]
+    assert sf.deconstruct()[3]['storage'] == 'int'
+    with pytest.raises(ValueError):
+        StatusField(S.S_STATUSDEF, storage='int')     # no codes
+    with pytest.raises(ValueError):
+        StatusField(CODED, storage='char')
+
+
+def test_int_storage_zero_code():
+    from types import SimpleNamespace
+    from dkmodelfields.subclassing import LazyCreator
+    txt = CODED.replace('10   new', '0    new')
+    sf = StatusField(txt, storage='int', lazy=True)
+    new = sf.statusdef.status['new']
+    assert new.code == 0
+    assert sf.get_prep_value('new') == 0
+    assert sf.to_python(0) is new
+    assert sf.from_db_value(0, None, connection) is new
+    sf.name = 'status'
+    descriptor = LazyCreator(sf)
+    obj = SimpleNamespace()
+    descriptor.__set__(obj, 0)                  # the raw database value
+    assert descriptor.__get__(obj) is new
+
+
+@pytest.mark.django_db
+def test_int_storage_db():
+    from testapp_dkmodelfields.models import SI
+    for name in ('first', 'second', 'third', 'second'):
+        SI.objects.create(status=name)
+    assert SI.objects.filter(status='second').count() == 2
+    assert SI.objects.filter(status__in=['init', 'post']).count() == 2
+    assert SI.objects.filter(status__in=[3]).count() == 2
+    assert sorted(SI.objects.values_list('status', flat=True).distinct(), key=str) == [
+        'first', 'second', 'third'
+    ]
+    obj = SI.objects.order_by('pk').last()
+    assert obj.status.name == 'second'
+    with connection.cursor() as c:
+        c.execute('SELECT status FROM testapp_dkmodelfields_si ORDER BY id')
+        assert [r[0] for r in c.fetchall()] == [1, 3, 2, 3]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model_name', ['S', 'SI'])
+def test_category_lookup(model_name):
+    from django.db.models import Count, F
+    from testapp_dkmodelfields import models
+    model = getattr(models, model_name)
+    for name in ('first', 'second', 'third', 'second', 'second'):
+        model.objects.create(status=name)
+
+    assert model.objects.filter(status__category='ok').count() == 3
+    assert model.objects.filter(status__category__in=['init', 'post']).count() == 2
+    assert model.objects.exclude(status__category='ok').count() == 2
+    sql = str(model.objects.filter(status__category='ok').query)
+    assert 'CASE' not in sql and ' IN (' in sql
+    with pytest.raises(ValueError):
+        model.objects.filter(status__category='second').count()
+    assert model.objects.filter(status__category__in=[]).count() == 0
+    assert model.objects.exclude(status__category__in=[]).count() == 5
+    annotated = model.objects.annotate(c=F('status__category'))
+    for category in ('init', 'ok', 'post'):
+        assert (annotated.filter(c=category).count()
+                == model.objects.filter(status__category=category).count())
+
+    counts = (model.objects.values('status__category')
+              .annotate(n=Count('id')).order_by('status__category'))
+    assert [(r['status__category'], r['n']) for r in counts] == [
+        ('init', 1), ('ok', 3), ('post', 1)
+    ]
+    assert sorted(model.objects.values_list('status__category', flat=True)) == [
+        'init', 'ok', 'ok', 'ok', 'post'
+    ]
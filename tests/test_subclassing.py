@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import ttcal
+from django.db import connection
+
+from dkmodelfields.subclassing import Creator, LazyCreator
+from testapp_dkmodelfields.models import L, M
+
+
+def test_descriptors():
+    assert isinstance(M.__dict__['month'], Creator)
+    assert not isinstance(M.__dict__['month'], LazyCreator)
+    assert isinstance(L.__dict__['month'], LazyCreator)
+
+
+def test_lazy_assignment():
+    obj = L(month='2017-03', duration=3600)
+    assert obj.__dict__['month'] == '2017-03'
+    assert obj.month == ttcal.Month(2017, 3)
+    assert obj.__dict__['month'] is obj.month
+    assert obj.duration == ttcal.Duration(hours=1)
+
+    obj.month = ttcal.Month(2018, 1)
+    assert obj.month == ttcal.Month(2018, 1)
+
+
+def test_lazy_load(db):
+    L.objects.all().delete()
+    L.objects.create(month=ttcal.Month(2017, 3), duration=ttcal.Duration(minutes=15))
+    mf = L._meta.get_field('month')
+    assert mf.get_db_converters(connection) == []
+
+    obj = L.objects.get()
+    assert obj.__dict__['month'] == datetime.date(2017, 3, 1)
+    assert obj.__dict__['duration'] == 900
+    assert obj.month == ttcal.Month(2017, 3)
+    assert obj.duration == ttcal.Duration(minutes=15)
+
+    name, path, args, kwargs = mf.deconstruct()
+    assert kwargs == {}                         # lazy is a runtime setting
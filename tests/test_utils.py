@@ -1,8 +1,31 @@
 # -*- coding: utf-8 -*-
 from datetime import timedelta
-from dkmodelfields.utils import xstr_to_timedelta
+from dkmodelfields.utils import xstr_to_timedelta, parse_many
 
 
 def test_xstr_to_timedelta():
     assert xstr_to_timedelta("1 day, 00:00:00") == timedelta(days=1)
     assert xstr_to_timedelta("") is None
+
+
+def test_xstr_to_timedelta_str_output():
+    for td in [timedelta(0), timedelta(seconds=3725), timedelta(days=1),
+               timedelta(days=12, seconds=1, microseconds=250000),
+               timedelta(days=400, seconds=86399, microseconds=1),
+               timedelta(milliseconds=-5), timedelta(days=-3, seconds=7)]:
+        assert xstr_to_timedelta(str(td)) == td
+
+
+def test_xstr_to_timedelta_user_input():
+    assert xstr_to_timedelta("2w 3d 4:05") == timedelta(days=17, hours=4, minutes=5)
+    assert xstr_to_timedelta("3 days") == timedelta(days=3)
+    assert xstr_to_timedelta("1:02") == timedelta(hours=1, minutes=2)
+    assert xstr_to_timedelta("-0:00:05") == timedelta(seconds=-5)
+    assert xstr_to_timedelta("-2d 1:00") == -timedelta(days=2, hours=1)
+
+
+def test_parse_many():
+    vals = ["1 day, 0:00:00", "", "2w", None, "0:00:01"]
+    assert list(parse_many(iter(vals))) == [
+        timedelta(days=1), None, timedelta(weeks=2), None, timedelta(seconds=1)
+    ]
@@ -3,6 +3,7 @@ from datetime import date, timedelta
 import pytest
 from django.core.exceptions import ValidationError
 from django.db import connection
+from django.db.models import Q
 from django.forms import Form
 
 import ttcal
@@ -101,3 +102,43 @@ def test_value_to_string():
     y = Y(yr=y2017)
     yf = Y._meta.get_field('yr')
     assert yf.value_to_string(y) == 2017
+
+
+def test_get_year_cache():
+    from dkmodelfields.yearfield import get_year, clear_year_cache
+    yf = YearField()
+    assert yf.to_python(2020) is yf.to_python(2020)
+    assert yf.to_python(2020) == ttcal.Year(2020)
+    assert get_year(1850) == ttcal.Year(1850)
+    assert get_year(1850) is not get_year(1850)      # outside the cached range
+    first = get_year(1999)
+    clear_year_cache()
+    assert get_year(1999) is not first
+
+
+def test_storage():
+    assert YearField().db_type(connection) == 'YEAR(4)'
+    yf = YearField(storage='smallint')
+    assert yf.db_type(connection) == 'SMALLINT'
+    name, path, args, kwargs = yf.deconstruct()
+    assert kwargs == {'storage': 'smallint'}
+    with pytest.raises(ValueError):
+        YearField(storage='int')
+
+
+@pytest.mark.django_db
+def test_smallint_decade_range():
+    from testapp_dkmodelfields.models import YS
+    for y in (1989, 1990, 1999, 2000, 2011):
+        YS.objects.create(yr=ttcal.Year(y))
+    years = lambda qs: sorted(o.yr.year for o in qs)
+    assert years(YS.objects.filter(yr__decade=1990)) == [1990, 1999]
+    assert years(YS.objects.filter(yr__decade=ttcal.Year(2015))) == [2011]
+    assert years(YS.objects.filter(yr__range=(1990, ttcal.Year(2000)))) == [1990, 1999, 2000]
+    assert years(YS.objects.filter(yr__gte=2000)) == [2000, 2011]
+    sql = str(YS.objects.filter(yr__decade=1990).query)
+    assert '>= 1990' in sql and '< 2000' in sql
+    assert 'WHERE (' in sql                          # parenthesized predicate
+    assert years(YS.objects.filter(Q(yr__decade=1990) | Q(yr=2011))) == [1990, 1999, 2011]
+    assert years(YS.objects.exclude(yr__decade=1990)) == [1989, 2000, 2011]
+    assert years(Y.objects.filter(yr__decade=1990)) == []
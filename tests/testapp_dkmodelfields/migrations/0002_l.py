@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.durationfield
+import dkmodelfields.monthfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='L',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', dkmodelfields.monthfield.MonthField(lazy=True)),
+                ('duration', dkmodelfields.durationfield.DurationField(default=0, lazy=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.durationfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0002_l'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='D',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('duration', dkmodelfields.durationfield.DurationField(null=True)),
+            ],
+        ),
+    ]
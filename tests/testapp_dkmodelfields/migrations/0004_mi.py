@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.monthfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0003_d'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MI',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', dkmodelfields.monthfield.MonthField(null=True)),
+                ('index', dkmodelfields.monthfield.MonthField(db_index=True, null=True, storage='int')),
+            ],
+        ),
+    ]
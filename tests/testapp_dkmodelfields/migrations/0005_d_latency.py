@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.durationfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0004_mi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='d',
+            name='latency',
+            field=dkmodelfields.durationfield.DurationField(null=True, precision='ms'),
+        ),
+    ]
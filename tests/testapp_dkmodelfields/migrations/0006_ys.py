@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.yearfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0005_d_latency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YS',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yr', dkmodelfields.yearfield.YearField(db_index=True, storage='smallint')),
+            ],
+        ),
+    ]
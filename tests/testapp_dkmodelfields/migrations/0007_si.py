@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+import dkmodelfields.statusfield
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp_dkmodelfields', '0006_ys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SI',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', dkmodelfields.statusfield.StatusField('\n        ==== =============== =========================================== ============\n        code status          verbose explanation                         category\n        ==== =============== =========================================== ============\n        1    first           First status                                # [init]\n        3    second          Second status                               # [ok]\n        2    third           Third status                                # [post]\n        ==== =============== =========================================== ============\n    ', choices=[('first', 'First status'), ('second', 'Second status'), ('third', 'Third status')], db_index=True, default='first', max_length=6, storage='int')),
+            ],
+        ),
+    ]
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.db import models
 
-from dkmodelfields import MonthField, YearField
+from dkmodelfields import MonthField, YearField, DurationField
 from dkmodelfields.statusfield import StatusField
 
 
@@ -13,6 +13,14 @@ class M(models.Model):
         return str(self.month)
 
 
+class MI(models.Model):
+    month = MonthField(null=True)
+    index = MonthField(storage='int', null=True, db_index=True)
+
+    def __str__(self):
+        return str(self.index)
+
+
 class Y(models.Model):
     yr = YearField()
 
@@ -20,6 +28,21 @@ class Y(models.Model):
         return str(self.yr)
 
 
+class YS(models.Model):
+    yr = YearField(storage='smallint', db_index=True)
+
+    def __str__(self):
+        return str(self.yr)
+
+
+class D(models.Model):
+    duration = DurationField(null=True)
+    latency = DurationField(precision='ms', null=True)
+
+    def __str__(self):
+        return str(self.duration)
+
+
 class AM(admin.ModelAdmin):
     pass
 
@@ -41,3 +64,28 @@ class S(models.Model):
 
     def __str__(self):
         return f'<class S status:{self.status} type:{type(self.status)})'
+
+
+class SI(models.Model):
+    SI_STATUSDEF = u"""
+        ==== =============== =========================================== ============
+        code status          verbose explanation                         category
+        ==== =============== =========================================== ============
+        1    first           First status                                # [init]
+        3    second          Second status                               # [ok]
+        2    third           Third status                                # [post]
+        ==== =============== =========================================== ============
+    """
+
+    status = StatusField(SI_STATUSDEF, storage='int', db_index=True, default='first')
+
+    def __str__(self):
+        return str(self.status)
+
+
+class L(models.Model):
+    month = MonthField(lazy=True)
+    duration = DurationField(lazy=True, default=0)
+
+    def __str__(self):
+        return str(self.month)